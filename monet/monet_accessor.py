@@ -13,7 +13,6 @@ try:
 except ImportError:
     has_xesmf = False
 try:
-    import pyresample as pr
     from pyresample.utils import wrap_longitudes
 
     has_pyresample = True
@@ -234,6 +233,156 @@ def _dataarray_coards_to_netcdf(dset, lat_name="lat", lon_name="lon"):
     return dset
 
 
+def _get_lonlat_index(accessor, lonlat=None):
+    """Get the :class:`~monet.util.interp_util.LonLatIndex` of the accessor's grid,
+    building it only if the grid coordinates have changed since the last call.
+
+    `lonlat` (tuple of arrays) can be passed to use instead of the
+    object's (MONET-standardized) longitude and latitude.
+    """
+    from .util.interp_util import LonLatIndex, _hash_arrays
+
+    if lonlat is None:
+        dset = _dataset_to_monet(accessor._obj)
+        lon, lat = dset.longitude.values, dset.latitude.values
+    else:
+        lon, lat = lonlat
+    key = _hash_arrays(lon, lat)
+    cached = getattr(accessor, "_lonlat_index", None)
+    if cached is None or cached[0] != key:
+        cached = (key, LonLatIndex(lon, lat))
+        accessor._lonlat_index = cached
+    return cached[1]
+
+
+def _unstructured_cells(data, target, radius_of_influence=None):
+    """Nearest cell center of unstructured-grid `data` to each site of `target`
+    (``.monet._df_to_da`` style, sites along ``x``).
+
+    Returns
+    -------
+    distance : numpy.ndarray
+        Great-circle distance (m) to the cell center.
+    index : numpy.ndarray
+        Cell index of each site, -1 where none within `radius_of_influence`.
+    """
+    model_lonlat = (data["longitude"].values, data["latitude"].values)
+    index = _get_lonlat_index(data.monet, lonlat=model_lonlat)
+    return index.query(
+        target["longitude"].values[0, :],
+        target["latitude"].values[0, :],
+        radius_of_influence=radius_of_influence,
+    )
+
+
+def _take_unstructured_cells(data, cells, return_distance=False):
+    """Implementation of ``remap_nearest_unstructured``,
+    taking `data` (xarray.Dataset) at the `cells` found by :func:`_unstructured_cells`.
+    """
+    distance, site_indices = cells
+    model_latitudes = data["latitude"].values
+    model_longitudes = data["longitude"].values
+    found = xr.DataArray(site_indices >= 0, dims="x")
+    site_indices = np.where(site_indices >= 0, site_indices, 0)
+
+    # Gather all variables and levels at once
+    cell_dim = data["latitude"].dims[-1]
+    dvars = [
+        dvar
+        for dvar in data.data_vars
+        if dvar not in ["latitude", "longitude"] and cell_dim in data[dvar].dims
+    ]
+    result = data[dvars].isel({cell_dim: xr.DataArray(site_indices, dims="x")})
+    result = result.drop_vars([c for c in result.coords if "x" in result[c].dims])
+    result = result.where(found)
+    level_dims = {d for d in result.dims if d not in ["time", "x"]}
+    if len(level_dims) == 1:
+        result = result.rename({level_dims.pop(): "z"})
+    result = result.expand_dims("y", axis=-2)
+
+    result.coords["x"] = ("x", np.arange(len(site_indices)))
+    result.coords["longitude"] = (
+        ("y", "x"),
+        np.where(found, model_longitudes[site_indices], np.nan)[np.newaxis],
+    )
+    result.coords["latitude"] = (
+        ("y", "x"),
+        np.where(found, model_latitudes[site_indices], np.nan)[np.newaxis],
+    )
+    if return_distance:
+        result["distance"] = (("y", "x"), distance[np.newaxis])
+        result["distance"].attrs["units"] = "m"
+
+    return result
+
+
+def _remap_idw(data, target, neighbours, power, cache=True, radius_of_influence=None, **kwargs):
+    """Implementation of the accessors' ``remap_nearest`` with ``neighbours > 1``,
+    through :func:`~monet.util.resample.build_remapper` (``'idw'``).
+
+    The pyresample options and neighbour info cache of the nearest path
+    don't apply, so they are rejected rather than ignored.
+    """
+    from .util.resample import build_remapper
+
+    if kwargs:
+        raise TypeError(
+            f"remap_nearest with neighbours > 1 only supports radius_of_influence, "
+            f"got unsupported option(s) {sorted(kwargs)}"
+        )
+    if not isinstance(cache, bool):
+        raise TypeError("remap_nearest with neighbours > 1 doesn't use a NeighbourInfoCache")
+    remapper = build_remapper(
+        data,
+        target,
+        method="idw",
+        radius_of_influence=radius_of_influence,
+        neighbours=neighbours,
+        power=power,
+    )
+    return remapper(data)
+
+
+def _nearest_ij(accessor, lat, lon, radius_of_influence=None, return_distance=False):
+    """Implementation of the accessors' ``nearest_ij``."""
+    index = _get_lonlat_index(accessor)
+    distance, flat = index.query(lon, lat, radius_of_influence=radius_of_influence)
+    if len(index.shape) != 2:
+        raise ValueError("nearest_ij requires 2-D (y, x) latitude and longitude")
+    found = flat >= 0
+    y, x = np.unravel_index(np.where(found, flat, 0), index.shape)
+    x = np.where(found, x, -1)
+    y = np.where(found, y, -1)
+    if x.ndim == 0:
+        x, y, distance = int(x), int(y), float(distance)
+    if return_distance:
+        return x, y, distance
+    else:
+        return x, y
+
+
+def _remap_nearest_dataset(resampler, dset):
+    """Remap all data variables of `dset` with a pyresample ``XArrayResamplerNN``
+    that has neighbour info.
+
+    The neighbour index is computed once and variables sharing dtype and dims
+    are gathered together (see :func:`monet.util.resample._take_nearest_dataset`);
+    any others go through ``get_sample_from_neighbour_info``.
+
+    Returns
+    -------
+    dict
+        Variable name -> remapped :class:`xarray.DataArray`.
+    """
+    from .util.resample import _source_index_from_resampler, _take_nearest_dataset
+
+    index = _source_index_from_resampler(resampler)
+    results, skipped = _take_nearest_dataset(dset, index, src_dims=dset.latitude.dims)
+    for name in skipped:
+        results[name] = resampler.get_sample_from_neighbour_info(dset[name])
+    return {name: results[name] for name in dset.data_vars}
+
+
 @pd.api.extensions.register_dataframe_accessor("monet")
 class MONETAccessorPandas:
     def __init__(self, pandas_obj):
@@ -404,63 +553,52 @@ class MONETAccessorPandas:
         df,
         radius_of_influence=1e5,
         combine=False,
+        return_distance=False,
         # lat_name=None, lon_name=None
     ):
         """Remap data in `df` to nearest points in self.
 
+        Uses a KD-tree on the sphere (:class:`~monet.util.interp_util.LonLatIndex`)
+        built on the `df` points, and selects the matching `df` rows by position.
+
         Parameters
         ----------
         df : pandas.DataFrame
             Data to be interpolated to nearest points in self.
         radius_of_influence : float
-            Radius of influence (meters), used by ``pyresample.kd_tree``.
+            Radius of influence (meters).
+            Points in self with no `df` point within this distance get NaN.
         combine : bool
             Merge with original self data.
+        return_distance : bool
+            Add column ``'distance'``, the distance (m) to the matched `df` point.
 
         Returns
         -------
         pandas.DataFrame
-            Interpolated dataframe.
+            Interpolated dataframe,
+            with one row per row of self, in the same order.
         """
+        from .util.interp_util import LonLatIndex
+
         source_data = self.rename_for_monet(df)
         target_data = self.rename_for_monet(self._obj)
-        # make fake index
-        if has_pyresample:
-            source_data = self._make_fake_index_var(source_data)
-            source_data_da = self._df_to_da(source_data)
-            target_data_da = self._df_to_da(target_data)
-            source = source_data_da.monet._get_CoordinateDefinition(source_data_da)
-            target = target_data_da.monet._get_CoordinateDefinition(target_data_da)
-            res = pr.kd_tree.XArrayResamplerNN(
-                source, target, radius_of_influence=radius_of_influence
-            )
-            res.get_neighbour_info()
-            # interpolate just the make_fake_index variable
-            # print(ds1)
-            r = res.get_sample_from_neighbour_info(source_data_da.monet_fake_index)
-            r.name = "monet_fake_index"
-            # r = ds2.monet.remap_nearest(
-            #     ds1, radius_of_influence=radius_of_influence)
-            # now merge back from original DataFrame
-            q = r.compute()
-            v = q.squeeze().to_dataframe()
-            result = v.merge(source_data, how="left", on="monet_fake_index").drop(
-                "monet_fake_index", axis=1
-            )
-            if combine:
-                columns_to_use = result.columns.difference(target_data.columns)
-                return pd.merge(
-                    target_data,
-                    result[columns_to_use],
-                    left_index=True,
-                    right_index=True,
-                    how="outer",
-                )
-            else:
-                return result
-
+        index = LonLatIndex(source_data.longitude.values, source_data.latitude.values)
+        distance, i = index.query(
+            target_data.longitude.values,
+            target_data.latitude.values,
+            radius_of_influence=radius_of_influence,
+        )
+        # Select by position; -1 (no match) is not a label, giving a row of NaN
+        result = source_data.reset_index(drop=True).reindex(i).reset_index(drop=True)
+        if return_distance:
+            result["distance"] = distance
+        if combine:
+            columns_to_use = result.columns.difference(target_data.columns)
+            result = result[columns_to_use].set_axis(target_data.index)
+            return pd.concat([target_data, result], axis=1)
         else:
-            print("pyresample unavailable. Try `import pyresample` and check the failure message.")
+            return result
 
     def cftime_to_datetime64(self, col=None):
         """Convert to datetime64.
@@ -719,20 +857,10 @@ class MONETAccessor:
                 return d
             elif has_pyresample:
                 dset = _dataset_to_monet(self._obj)
-                lons, lats = utils.check_and_wrap(dset.longitude.values, dset.latitude.values)
-                # swath = llsd(longitude=lons, latitude=lats)
-                x_ll, y_ll = dset.monet.nearest_ij(lat=float(lat_min), lon=float(lon_min))
-                x_ur, y_ur = dset.monet.nearest_ij(lat=float(lat_max), lon=float(lon_max))
-                # pswath_ll = npsd(longitude=float(lon_min),
-                #                  latitude=float(lat_min))
-                # pswath_ur = npsd(longitude=float(lon_max),
-                #                  latitude=float(lat_max))
-                # row, col = utils.generate_nearest_neighbour_linesample_arrays(
-                #     swath, pswath_ll, 1e6)
-                # y_ll, x_ll = row[0][0], col[0][0]
-                # row, col = utils.generate_nearest_neighbour_linesample_arrays(
-                #     swath, pswath_ur, 1e6)
-                # y_ur, x_ur = row[0][0], col[0][0]
+                # Both corners in one query of the (cached) grid index
+                (x_ll, x_ur), (y_ll, y_ur) = self.nearest_ij(
+                    lat=[float(lat_min), float(lat_max)], lon=[float(lon_min), float(lon_max)]
+                )
                 if x_ur < x_ll:
                     x1 = dset.x.where(dset.x >= x_ll, drop=True).values
                     x2 = dset.x.where(dset.x <= x_ur, drop=True).values
@@ -841,49 +969,41 @@ class MONETAccessor:
                 out = resample_xesmf(self._obj, output, **kwargs)
                 return _rename_latlon(out)
 
-    def nearest_ij(self, lat=None, lon=None, **kwargs):
-        """Uses pyresample to interpolate to find the i, j index of grid with respect to the given lat lon.
+    def nearest_ij(self, lat=None, lon=None, radius_of_influence=None, return_distance=False):
+        """Find the i, j index of the grid cell nearest to the given latitude(s) and longitude(s).
+
+        The grid's spatial index (KD-tree) is built on first use
+        and kept on the accessor, so repeated calls only pay for the query.
 
         Parameters
         ----------
-        lat : float
-            latitude in question
-        lon : float
-            longitude in question
-        **kwargs : dict
-            pyresample kwargs for nearest neighbor interpolation
+        lat : float or array-like
+            latitude(s) in question
+        lon : float or array-like
+            longitude(s) in question, same shape as `lat`
+        radius_of_influence : float, optional
+            Maximum great-circle distance (m).
+            Points with no grid cell within this distance get index -1.
+        return_distance : bool
+            Also return the great-circle distance (m) to the grid cell.
 
         Returns
         -------
         i,j
-            Returns the i (x index) and j (y index) of the given latitude longitude value
-
+            Returns the i (x index) and j (y index) of the given latitude longitude value.
+            Scalars for scalar input, else arrays with the shape of `lat`.
+            If `return_distance`, the distance is returned as a third element.
         """
-        try:
-            from pyresample import utils
-
-            from .util.interp_util import lonlat_to_swathdefinition as llsd
-            from .util.interp_util import nearest_point_swathdefinition as npsd
-
-            has_pyresample = True
-        except ImportError:
-            has_pyresample = False
-            print("requires pyresample to be installed")
-
-        try:
-            if lat is None or lon is None:
-                raise RuntimeError
-        except RuntimeError:
-            print("Must provide latitude and longitude")
-
-        if has_pyresample:
-            dset = _dataset_to_monet(self._obj)
-            lons, lats = utils.check_and_wrap(dset.longitude.values, dset.latitude.values)
-            swath = llsd(longitude=lons, latitude=lats)
-            pswath = npsd(longitude=float(lon), latitude=float(lat))
-            row, col = utils.generate_nearest_neighbour_linesample_arrays(swath, pswath, float(1e6))
-            y, x = row[0][0], col[0][0]
-            return x, y
+        if lat is None or lon is None:
+            raise ValueError("Must provide latitude and longitude")
+
+        return _nearest_ij(
+            self,
+            lat,
+            lon,
+            radius_of_influence=radius_of_influence,
+            return_distance=return_distance,
+        )
 
     def nearest_latlon(self, lat=None, lon=None, cleanup=True, esmf=False, **kwargs):
         """Uses xesmf to interpolate to a given latitude and longitude.  Note
@@ -950,14 +1070,10 @@ class MONETAccessor:
             With defaults added if not already set.
             Note modified in place.
         """
-        if "reuse_weights" not in kwargs:
-            kwargs["reuse_weights"] = False
         if "method" not in kwargs:
             kwargs["method"] = "bilinear"
         if "periodic" not in kwargs:
             kwargs["periodic"] = False
-        if "filename" not in kwargs:
-            kwargs["filename"] = "monet_xesmf_regrid_file.nc"
         return kwargs
 
     def quick_imshow(self, map_kws=None, roll_dateline=False, **kwargs):
@@ -1198,7 +1314,7 @@ class MONETAccessor:
             g = geo.CoordinateDefinition(lats=self._obj.latitude, lons=self._obj.longitude)
         return g
 
-    def remap_nearest(self, data, **kwargs):
+    def remap_nearest(self, data, cache=True, neighbours=1, power=2, **kwargs):
         """Remap `data` from another grid to the current self grid using pyresample
         nearest-neighbor interpolation.
 
@@ -1208,33 +1324,45 @@ class MONETAccessor:
         ----------
         data : xarray.DataArray or xarray.Dataset
             Data to be interpolated to nearest points in self.
+        cache : bool or monet.util.resample.NeighbourInfoCache
+            Reuse neighbour info computed for the same pair of grids.
+            ``True`` uses :data:`monet.util.resample.neighbour_info_cache`.
+            Nearest neighbour (``neighbours=1``) only.
+        neighbours : int
+            If greater than 1, take the inverse-distance weighted mean
+            of this many nearest source points instead
+            (NaN source values are left out of the mean).
+        power : float
+            Power of the inverse distance used as weight when ``neighbours > 1``.
         radius_of_influence : float
             Radius of influence (meters), used by ``pyresample.kd_tree``.
+        **kwargs
+            Passed on to ``pyresample.kd_tree.XArrayResamplerNN``
+            (``neighbours=1`` only: with ``neighbours > 1``,
+            only `radius_of_influence` is supported).
 
         Returns
         -------
         xarray.DataArray or xarray.Dataset
             Data on current (self) grid.
         """
-        from pyresample import kd_tree
+        from .util.resample import nearest_neighbour_resampler
+
+        if neighbours > 1:
+            return _remap_idw(data, self._obj, neighbours, power, cache=cache, **kwargs)
 
         # from .grids import get_generic_projection_from_proj4
         # check to see if grid is supplied
         source_data = _dataset_to_monet(data)
         target_data = _dataset_to_monet(self._obj)
-        source = self._get_CoordinateDefinition(data=source_data)
-        target = self._get_CoordinateDefinition(data=target_data)
-        r = kd_tree.XArrayResamplerNN(source, target, **kwargs)
-        r.get_neighbour_info()
+        r = nearest_neighbour_resampler(source_data, target_data, cache=cache, **kwargs)
         if isinstance(source_data, xr.DataArray):
             result = r.get_sample_from_neighbour_info(source_data)
             result.name = source_data.name
             result["latitude"] = target_data.latitude
 
         elif isinstance(source_data, xr.Dataset):
-            results = {}
-            for i in source_data.data_vars.keys():
-                results[i] = r.get_sample_from_neighbour_info(source_data[i])
+            results = _remap_nearest_dataset(r, source_data)
             result = xr.Dataset(results)
             if bool(source_data.attrs):
                 result.attrs = source_data.attrs
@@ -1243,6 +1371,75 @@ class MONETAccessor:
 
         return result
 
+    def build_remapper(self, data, method="nearest", **kwargs):
+        """Precompute the remapping from the grid of `data` to the current self grid.
+
+        The returned :class:`~monet.util.resample.Remapper` can be applied
+        to any DataArray or Dataset on the grid of `data`, pickled, and saved.
+
+        Parameters
+        ----------
+        data : xarray.DataArray or xarray.Dataset
+            Object on the source grid.
+        method : str
+            ``'nearest'``, ``'idw'`` (inverse-distance weighted k-nearest),
+            or an xESMF method, e.g. ``'bilinear'``.
+        kwargs : dict
+            Passed on to :func:`~monet.util.resample.build_remapper`.
+
+        Returns
+        -------
+        monet.util.resample.Remapper
+        """
+        from .util.resample import build_remapper
+
+        return build_remapper(data, self._obj, method=method, **kwargs)
+
+    def remap_streaming(
+        self,
+        data,
+        path=None,
+        method="nearest",
+        max_memory="1GiB",
+        block_dims=("time", "z"),
+        **kwargs,
+    ):
+        """Remap `data` from another grid to the current self grid
+        in bounded-memory time/level blocks,
+        optionally writing the result to a zarr store or netCDF file as it goes.
+
+        Parameters
+        ----------
+        data : xarray.DataArray or xarray.Dataset
+            Data on the source grid,
+            e.g. a (time, z, y, x) field opened lazily from file.
+        path : str or path-like, optional
+            Output zarr store (``.zarr``) or netCDF file.
+        method : str
+            ``'nearest'``, ``'idw'``, or an xESMF method, e.g. ``'bilinear'``.
+        max_memory : int or str
+            Memory cap, e.g. ``'4GiB'``.
+        block_dims : tuple of str
+            Dimensions to process in blocks.
+        kwargs : dict
+            Passed on to :func:`~monet.util.resample.build_remapper`.
+
+        Returns
+        -------
+        xarray.DataArray or xarray.Dataset
+            Lazy result on current (self) grid.
+
+        See Also
+        --------
+        monet.util.resample.remap_streaming
+        """
+        from .util.resample import build_remapper, remap_streaming
+
+        remapper = build_remapper(data, self._obj, method=method, **kwargs)
+        return remap_streaming(
+            remapper, data, path=path, max_memory=max_memory, block_dims=block_dims
+        )
+
     def remap_xesmf(self, data, **kwargs):
         """Remap `data` from another grid to the current grid of self using xESMF.
 
@@ -1429,54 +1626,147 @@ class MONETAccessorDataset:
             ds[name] = xr.apply_ufunc(vectorize(cf_to_dt64), ds[name])
         return ds
 
-    def remap_xesmf(self, data, **kwargs):
+    def build_remapper(self, data, method="nearest", **kwargs):
+        """Precompute the remapping from the grid of `data` to the current self grid.
+
+        The returned :class:`~monet.util.resample.Remapper` can be applied
+        to any DataArray or Dataset on the grid of `data`, pickled, and saved.
+
+        Parameters
+        ----------
+        data : xarray.DataArray or xarray.Dataset
+            Object on the source grid.
+        method : str
+            ``'nearest'``, ``'idw'`` (inverse-distance weighted k-nearest),
+            or an xESMF method, e.g. ``'bilinear'``.
+        kwargs : dict
+            Passed on to :func:`~monet.util.resample.build_remapper`.
+
+        Returns
+        -------
+        monet.util.resample.Remapper
+        """
+        from .util.resample import build_remapper
+
+        return build_remapper(data, self._obj, method=method, **kwargs)
+
+    def remap_streaming(
+        self,
+        data,
+        path=None,
+        method="nearest",
+        max_memory="1GiB",
+        block_dims=("time", "z"),
+        **kwargs,
+    ):
+        """Remap `data` from another grid to the current self grid
+        in bounded-memory time/level blocks,
+        optionally writing the result to a zarr store or netCDF file as it goes.
+
+        Parameters
+        ----------
+        data : xarray.DataArray or xarray.Dataset
+            Data on the source grid,
+            e.g. a (time, z, y, x) field opened lazily from file.
+        path : str or path-like, optional
+            Output zarr store (``.zarr``) or netCDF file.
+        method : str
+            ``'nearest'``, ``'idw'``, or an xESMF method, e.g. ``'bilinear'``.
+        max_memory : int or str
+            Memory cap, e.g. ``'4GiB'``.
+        block_dims : tuple of str
+            Dimensions to process in blocks.
+        kwargs : dict
+            Passed on to :func:`~monet.util.resample.build_remapper`.
+
+        Returns
+        -------
+        xarray.DataArray or xarray.Dataset
+            Lazy result on current (self) grid.
+
+        See Also
+        --------
+        monet.util.resample.remap_streaming
+        """
+        from .util.resample import build_remapper, remap_streaming
+
+        remapper = build_remapper(data, self._obj, method=method, **kwargs)
+        return remap_streaming(
+            remapper, data, path=path, max_memory=max_memory, block_dims=block_dims
+        )
+
+    def remap_xesmf(self, data, inplace=True, **kwargs):
         """Remap `data` from another grid to the current grid of self using xESMF.
 
         Parameters
         ----------
         data : xarray.DataArray or xarray.Dataset
             Data to be remapped.
+        inplace : bool
+            Add the remapped data to self.
+            Otherwise, self is left unchanged
+            and a new Dataset (self plus the remapped data) is returned.
         kwargs : dict
             Passed on to :func:`~monet.util.resample.resample_xesmf`
             and then to ``xesmf.Regridder``.
+
+        Returns
+        -------
+        xarray.DataArray or xarray.Dataset
+            If `inplace`, the remapped data, also added to self
+            (with ``'_y'`` appended to names already in self);
+            otherwise, the new Dataset.
+            For a Dataset, all variables are regridded together.
         """
         if has_xesmf:
             try:
                 if isinstance(data, xr.DataArray):
                     data = _rename_latlon(data)
-                    self._remap_xesmf_dataarray(data, **kwargs)
+                    out = self._remap_xesmf_dataarray(data, **kwargs)
+                    out = out.to_dataset()
                 elif isinstance(data, xr.Dataset):
                     data = _rename_latlon(data)
-                    self._remap_xesmf_dataset(data, **kwargs)
+                    out = self._remap_xesmf_dataset(data, **kwargs)
                 else:
                     raise TypeError
             except TypeError:
                 print("data must be an xarray.DataArray or xarray.Dataset")
                 # TODO: raise
+                return
+            if not inplace:
+                # New Dataset sharing the data of self (no copy)
+                return self._obj.assign(out.data_vars)
+            self._obj.update(out)
+            return out[list(out.data_vars)[0]] if isinstance(data, xr.DataArray) else out
 
         else:
             print("xesmf unavailable. Try `import xesmf` and check the failure message.")
 
-    def _remap_xesmf_dataset(self, dset, filename="monet_xesmf_regrid_file.nc", **kwargs):
+    def _remap_xesmf_dataset(self, dset, method="bilinear", **kwargs):
+        """Regrid all variables of `dset` to the dataset object in one pass
+        (see :func:`~monet.util.resample.resample_xesmf`).
+
+        Parameters
+        ----------
+        dset : xarray.Dataset
+
+        Returns
+        -------
+        xarray.Dataset
+            New Dataset, with ``'_y'`` appended to the names
+            of variables already in self.
+            Neither self nor `dset` is modified.
+        """
+        from .util import resample
+
         skip_keys = ["lat", "lon", "time", "TFLAG"]
-        vars = pd.Series(list(dset.variables))
-        loop_vars = vars.loc[~vars.isin(skip_keys)]
-        dataarray = dset[loop_vars[0]]
-        da = self._remap_xesmf_dataarray(dataarray, filename=filename, **kwargs)
-        self._obj[da.name] = da
-        das = {}
-        das[da.name] = da
-        for i in loop_vars[1:]:
-            dataarray = dset[i]
-            tmp = self._remap_xesmf_dataarray(
-                dataarray, filename=filename, reuse_weights=True, **kwargs
-            )
-            das[tmp.name] = tmp.copy()
-        return xr.Dataset(das)
+        dset = dset.drop_vars([name for name in skip_keys if name in dset.data_vars])
+        out = resample.resample_xesmf(dset, self._obj, method=method, **kwargs)
+        return out.rename(
+            {name: name + "_y" for name in out.data_vars if name in self._obj.variables}
+        )
 
-    def _remap_xesmf_dataarray(
-        self, dataarray, method="bilinear", filename="monet_xesmf_regrid_file.nc", **kwargs
-    ):
+    def _remap_xesmf_dataarray(self, dataarray, method="bilinear", **kwargs):
         """Resample the DataArray to the dataset object.
 
         Parameters
@@ -1486,14 +1776,15 @@ class MONETAccessorDataset:
         Returns
         -------
         xarray.DataArray
+            With ``'_y'`` appended to the name if already in self.
+            Self is not modified.
         """
         from .util import resample
 
         target = self._obj
-        out = resample.resample_xesmf(dataarray, target, method=method, filename=filename, **kwargs)
+        out = resample.resample_xesmf(dataarray, target, method=method, **kwargs)
         if out.name in self._obj.variables:
             out.name = out.name + "_y"
-        self._obj[out.name] = out
         return out
 
     def _get_CoordinateDefinition(self, data=None):
@@ -1511,7 +1802,7 @@ class MONETAccessorDataset:
             g = geo.CoordinateDefinition(lats=self._obj.latitude, lons=self._obj.longitude)
         return g
 
-    def remap_nearest(self, data, radius_of_influence=1e6):
+    def remap_nearest(self, data, radius_of_influence=1e6, cache=True, neighbours=1, power=2):
         """Remap `data` from another grid to the current self grid using pyresample
         nearest-neighbor interpolation.
 
@@ -1522,13 +1813,23 @@ class MONETAccessorDataset:
             Must include lat/lon coordinates.
         radius_of_influence : float
             Radius of influence (meters), used by ``pyresample.kd_tree``.
+        cache : bool or monet.util.resample.NeighbourInfoCache
+            Reuse neighbour info computed for the same pair of grids.
+            ``True`` uses :data:`monet.util.resample.neighbour_info_cache`.
+            Nearest neighbour (``neighbours=1``) only.
+        neighbours : int
+            If greater than 1, take the inverse-distance weighted mean
+            of this many nearest source points instead
+            (NaN source values are left out of the mean).
+        power : float
+            Power of the inverse distance used as weight when ``neighbours > 1``.
 
         Returns
         -------
         xarray.Dataset or xarray.DataArray
             Data on current (self) grid.
         """
-        from pyresample import kd_tree
+        from .util.resample import nearest_neighbour_resampler
 
         # from .grids import get_generic_projection_from_proj4
         # check to see if grid is supplied
@@ -1542,21 +1843,27 @@ class MONETAccessorDataset:
                 raise TypeError
         except TypeError:
             print("data must be either an Xarray.DataArray or Xarray.Dataset")
+        if neighbours > 1:
+            return _remap_idw(
+                data,
+                self._obj,
+                neighbours,
+                power,
+                cache=cache,
+                radius_of_influence=radius_of_influence,
+            )
         source_data = _dataset_to_monet(data)
         target_data = _dataset_to_monet(self._obj)
-        source = self._get_CoordinateDefinition(source_data)
-        target = self._get_CoordinateDefinition(target_data)
-        r = kd_tree.XArrayResamplerNN(source, target, radius_of_influence=radius_of_influence)
-        r.get_neighbour_info()
+        r = nearest_neighbour_resampler(
+            source_data, target_data, cache=cache, radius_of_influence=radius_of_influence
+        )
         if isinstance(source_data, xr.DataArray):
             result = r.get_sample_from_neighbour_info(source_data)
             result.name = source_data.name
             result["latitude"] = target_data.latitude
 
         elif isinstance(source_data, xr.Dataset):
-            results = {}
-            for i in source_data.data_vars.keys():
-                results[i] = r.get_sample_from_neighbour_info(source_data[i])
+            results = _remap_nearest_dataset(r, source_data)
             result = xr.Dataset(results)
             if bool(source_data.attrs):
                 result.attrs = source_data.attrs
@@ -1566,130 +1873,75 @@ class MONETAccessorDataset:
         return result
 
     # Add nearest function for unstructured grid
-    def remap_nearest_unstructured(self, data):
+    def remap_nearest_unstructured(self, data, radius_of_influence=None, return_distance=False):
         """Find the closest model data (`data`) to the observation (self)
         for unstructured grid model data.
 
-        Based on model grid cell center locations.
+        Based on model grid cell center locations,
+        using a KD-tree on the sphere (see :class:`~monet.util.interp_util.LonLatIndex`),
+        which is cached on `data`'s accessor.
 
         Parameters
         ----------
         data : xarray.Dataset
             Data to be interpolated, including lat/lon coordinates.
+            Variables should have the cell dimension last,
+            e.g. ``(time, z, cell)``.
+        radius_of_influence : float, optional
+            Maximum great-circle distance (m) between site and cell center.
+            Sites with no cell within this distance get NaN.
+        return_distance : bool
+            Add the distance (m) to the matched cell center
+            as variable ``'distance'``.
 
         Returns
         -------
         xarray.Dataset
-            Data on self grid.
+            Data on self grid, all vertical levels.
         """
+        if not isinstance(data, (xr.DataArray, xr.Dataset)):
+            raise TypeError("data must be either an xarray.DataArray or xarray.Dataset")
+        if isinstance(data, xr.DataArray):
+            data = data.to_dataset()
 
-        try:
-            check_error = False
-            if isinstance(data, xr.DataArray) or isinstance(data, xr.Dataset):
-                check_error = False
-            else:
-                check_error = True
-            if check_error:
-                raise TypeError
-        except TypeError:
-            print("data must be either an xarray.DataArray or xarray.Dataset")
-
-        model_data = data
-        obs_data = self._obj
-
-        site_indices = []
-        site_latitudes = obs_data["latitude"].values[0, :]
-        site_longitudes = obs_data["longitude"].values[0, :]
-        model_latitudes = model_data["latitude"].values
-        model_longitudes = model_data["longitude"].values
-
-        for siteii in np.arange(len(obs_data["siteid"][0])):
-            # ==== Needed to be updated in the future =====
-            # currently based on center lon & lat
-            # lon_tmp = d2['longitude'].values[0,siteii]
-            # if lon_tmp < -0.:
-            #    lon_tmp += 360.
-            #
-            # site_indices.append( get_site_index( lon_tmp,
-            #                                     d2['latitude'].values[0,siteii],
-            #                                     scrip_file=d1.monet.scrip, check_N=20 ) )
-            site_indices.append(
-                np.argmin(
-                    np.abs(site_latitudes[siteii] - model_latitudes)
-                    + np.abs(site_longitudes[siteii] - model_longitudes)
-                )
-            )
-
-        dict_data = {}
-        for dvar in model_data.data_vars:
-            if dvar in ["latitude", "longitude"]:
-                continue
-            else:
-                dict_data[dvar] = (
-                    ["time", "z", "y", "x"],
-                    model_data[dvar][:, 0, np.array(site_indices)].values.reshape(
-                        len(model_data["time"]), 1, 1, len(site_indices)
-                    ),
-                )
+        cells = _unstructured_cells(data, self._obj, radius_of_influence=radius_of_influence)
+        return _take_unstructured_cells(data, cells, return_distance=return_distance)
 
-        dict_coords = {
-            "time": (["time"], model_data["time"].values),
-            "x": (["x"], np.arange(len(site_indices))),
-            "longitude": (
-                ["y", "x"],
-                model_longitudes[np.array(site_indices)].reshape(1, len(site_indices)),
-            ),
-            "latitude": (
-                ["y", "x"],
-                model_latitudes[np.array(site_indices)].reshape(1, len(site_indices)),
-            ),
-        }
-
-        result = xr.Dataset(data_vars=dict_data, coords=dict_coords)
+    def nearest_ij(self, lat=None, lon=None, radius_of_influence=None, return_distance=False):
+        """Find the i, j index of the grid cell nearest to the given latitude(s) and longitude(s).
 
-        return result
-
-    def nearest_ij(self, lat=None, lon=None, **kwargs):
-        """Uses pyresample to interpolate to find the i, j index of grid with respect to the given lat lon.
+        The grid's spatial index (KD-tree) is built on first use
+        and kept on the accessor, so repeated calls only pay for the query.
 
         Parameters
         ----------
-        lat : float
-            latitude in question
-        lon : float
-            longitude in question
-        **kwargs : dict
-            pyresample kwargs for nearest neighbor interpolation
+        lat : float or array-like
+            latitude(s) in question
+        lon : float or array-like
+            longitude(s) in question, same shape as `lat`
+        radius_of_influence : float, optional
+            Maximum great-circle distance (m).
+            Points with no grid cell within this distance get index -1.
+        return_distance : bool
+            Also return the great-circle distance (m) to the grid cell.
 
         Returns
         -------
         i,j
-            Returns the i (x index) and j (y index) of the given latitude longitude value
+            Returns the i (x index) and j (y index) of the given latitude longitude value.
+            Scalars for scalar input, else arrays with the shape of `lat`.
+            If `return_distance`, the distance is returned as a third element.
         """
-        try:
-            from pyresample import utils
-
-            has_pyresample = True
-        except ImportError:
-            has_pyresample = False
-            print("requires pyresample to be installed")
-        from .util.interp_util import lonlat_to_swathdefinition as llsd
-        from .util.interp_util import nearest_point_swathdefinition as npsd
-
-        try:
-            if lat is None or lon is None:
-                raise RuntimeError
-        except RuntimeError:
-            print("Must provide latitude and longitude")
-
-        if has_pyresample:
-            dset = _dataset_to_monet(self._obj)
-            lons, lats = utils.check_and_wrap(dset.longitude.values, dset.latitude.values)
-            swath = llsd(longitude=lons, latitude=lats)
-            pswath = npsd(longitude=float(lon), latitude=float(lat))
-            row, col = utils.generate_nearest_neighbour_linesample_arrays(swath, pswath, float(1e6))
-            y, x = row[0][0], col[0][0]
-            return x, y
+        if lat is None or lon is None:
+            raise ValueError("Must provide latitude and longitude")
+
+        return _nearest_ij(
+            self,
+            lat,
+            lon,
+            radius_of_influence=radius_of_influence,
+            return_distance=return_distance,
+        )
 
     def nearest_latlon(self, lat=None, lon=None, cleanup=True, esmf=False, **kwargs):
         """Uses xesmf to interpolate to a given latitude and longitude.  Note
@@ -1758,14 +2010,10 @@ class MONETAccessorDataset:
             With defaults added if not already set.
             Note modified in place.
         """
-        if "reuse_weights" not in kwargs:
-            kwargs["reuse_weights"] = False
         if "method" not in kwargs:
             kwargs["method"] = "bilinear"
         if "periodic" not in kwargs:
             kwargs["periodic"] = False
-        if "filename" not in kwargs:
-            kwargs["filename"] = "monet_xesmf_regrid_file.nc"
         return kwargs
 
     def interp_constant_lat(self, lat=None, lat_name="latitude", lon_name="longitude", **kwargs):
@@ -1910,28 +2158,15 @@ class MONETAccessorDataset:
             from numpy import concatenate
             from pyresample import utils
 
-            from .util.interp_util import lonlat_to_swathdefinition as llsd
-            from .util.interp_util import nearest_point_swathdefinition as npsd
-
             has_pyresample = True
         except ImportError:
             has_pyresample = False
         try:
             if has_pyresample:
-                lons, lats = utils.check_and_wrap(
-                    self._obj.longitude.values, self._obj.latitude.values
-                )
-                swath = llsd(longitude=lons, latitude=lats)
-                pswath_ll = npsd(longitude=float(lon_min), latitude=float(lat_min))
-                pswath_ur = npsd(longitude=float(lon_max), latitude=float(lat_max))
-                row, col = utils.generate_nearest_neighbour_linesample_arrays(
-                    swath, pswath_ll, float(1e6)
-                )
-                y_ll, x_ll = row[0][0], col[0][0]
-                row, col = utils.generate_nearest_neighbour_linesample_arrays(
-                    swath, pswath_ur, float(1e6)
+                # Both corners in one query of the (cached) grid index
+                (x_ll, x_ur), (y_ll, y_ur) = self.nearest_ij(
+                    lat=[float(lat_min), float(lat_max)], lon=[float(lon_min), float(lon_max)]
                 )
-                y_ur, x_ur = row[0][0], col[0][0]
                 if x_ur < x_ll:
                     x1 = self._obj.x.where(self._obj.x >= x_ll, drop=True).values
                     x2 = self._obj.x.where(self._obj.x <= x_ur, drop=True).values
@@ -1,8 +1,8 @@
 import xarray as xr
-from pandas import Series, merge_asof
+from pandas import Index, Series, merge_asof
 
 
-def combine_da_to_df(da, df, *, merge=True, **kwargs):
+def combine_da_to_df(da, df, *, merge=True, time_interp=None, time_tolerance=None, **kwargs):
     """Combine xarray data array `da` with spatial information
     point observations in dataframe `df`, returning a new dataframe.
 
@@ -19,6 +19,17 @@ def combine_da_to_df(da, df, *, merge=True, **kwargs):
     merge : bool
         Merge interpolated `df` data with `da` data.
         Otherwise, return interpolated `da` data only.
+    time_interp : {None, 'nearest', 'linear'}
+        How to pair in time when merging.
+        By default, model and observation times must match exactly.
+        With ``'nearest'`` or ``'linear'``, the model data is interpolated
+        to the time of each row of `df` (within the model time range),
+        for observations off the model output times.
+        Requires the model data to have only time and site dims
+        (select a level first).
+    time_tolerance : str or pandas.Timedelta, optional
+        Maximum time difference between an observation
+        and the nearest model time for `time_interp`.
     kwargs : dict
         Passed to :meth:`~monet.monet_accessor.MONETAccessor.remap_nearest`
         (if `da` is not unstructured-grid data).
@@ -27,18 +38,222 @@ def combine_da_to_df(da, df, *, merge=True, **kwargs):
     -------
     pandas.DataFrame
     """
-    target_da = df.drop_duplicates(subset=["siteid"]).dropna(
-        subset=["latitude", "longitude", "siteid"]
-    )
-    target_data_da = target_da.monet._df_to_da()
+    sites, target, site_index = _obs_sites(df)
 
     # Add if statement for unstructured grid output
     if da.attrs.get("mio_has_unstructured_grid", False):
-        da_interped = target_data_da.monet.remap_nearest_unstructured(da).compute()
+        from ..monet_accessor import _unstructured_cells
+
+        da_interped = _remap_unstructured(da, _unstructured_cells(da, target)).compute()
+    else:
+        da_interped = target.monet.remap_nearest(da, **kwargs).compute()
+
+    return _interped_to_df(
+        da,
+        da_interped,
+        sites,
+        df,
+        merge=merge,
+        time_interp=time_interp,
+        time_tolerance=time_tolerance,
+        site_index=site_index,
+    )
+
+
+def _obs_sites(df):
+    """Sites of the observations in `df`.
+
+    Returns
+    -------
+    sites : pandas.DataFrame
+        First row of each site with coordinates.
+    target : xarray.DataArray
+        Sites as target points (``x`` dimension), see ``.monet._df_to_da``.
+    site_index : numpy.ndarray
+        Position in `sites` of the site of each row of `df`
+        (-1 if not present).
+    """
+    sites = df.drop_duplicates(subset=["siteid"]).dropna(subset=["latitude", "longitude", "siteid"])
+    target = sites.monet._df_to_da()
+    site_index = Index(sites["siteid"]).get_indexer(df["siteid"])
+    return sites, target, site_index
+
+
+def _remap_unstructured(ds, cells):
+    """Unstructured-grid data `ds` at the nearest `cells` of the sites
+    (see :func:`~monet.monet_accessor._unstructured_cells`),
+    first model level only.
+    """
+    from ..monet_accessor import _take_unstructured_cells
+
+    if isinstance(ds, xr.DataArray):
+        ds = ds.to_dataset()
+    da_interped = _take_unstructured_cells(ds, cells)
+    if "z" in da_interped.dims:
+        # Pair the first model level only
+        da_interped = da_interped.isel(z=[0])
+    return da_interped
+
+
+def _site_remapper(ds, target, remappers, method="nearest", **kwargs):
+    """Function remapping model data on the grid of `ds` to the `target` sites,
+    taken from `remappers` (dict, grid hash -> function) or built and added to it,
+    so that the neighbour search is done once per grid.
+
+    For unstructured-grid data (``'mio_has_unstructured_grid'`` attribute)
+    this takes the nearest cells (see :func:`_remap_unstructured`),
+    otherwise it is a :class:`~monet.util.resample.Remapper`
+    (see :func:`~monet.util.resample.build_remapper` for `method` and `kwargs`).
+    Either can be pickled.
+    """
+    import functools
+
+    from ..monet_accessor import _dataset_to_monet, _unstructured_cells
+    from .interp_util import _hash_arrays
+    from .resample import build_remapper
+
+    unstructured = ds.attrs.get("mio_has_unstructured_grid", False)
+    grid = ds if unstructured else _dataset_to_monet(ds)
+    key = (unstructured, _hash_arrays(grid.longitude.values, grid.latitude.values))
+    if key not in remappers:
+        if unstructured:
+            cells = _unstructured_cells(ds, target)
+            remappers[key] = functools.partial(_remap_unstructured, cells=cells)
+        else:
+            remappers[key] = build_remapper(grid, target, method=method, **kwargs)
+    return remappers[key]
+
+
+def _pairable(da_interped):
+    """Whether `da_interped` can be paired by :func:`_take_obs`:
+    unique datetime64 times and no dims other than time and site
+    of size more than one.
+    """
+    import numpy as np
+
+    if "time" not in da_interped.dims:
+        return False
+    time = da_interped.indexes["time"]
+    variables = (
+        da_interped.data_vars.values() if isinstance(da_interped, xr.Dataset) else [da_interped]
+    )
+    return (
+        np.issubdtype(time.dtype, np.datetime64)
+        and time.is_unique
+        and all(v.sizes[d] == 1 for v in variables for d in v.dims if d not in ["time", "x"])
+    )
+
+
+def _take_obs(da_interped, sites, df, method="exact", tolerance=None, site_index=None):
+    """Take `da_interped` (time, site) data at the time and site
+    of each row of `df`,
+    by index arithmetic on the time x site arrays (no merge).
+
+    Parameters
+    ----------
+    method : {'exact', 'nearest', 'linear'}
+        Time matching.
+    tolerance : str or pandas.Timedelta, optional
+        Maximum time difference to the nearest model time.
+    site_index : numpy.ndarray, optional
+        Position in `sites` of the site of each row of `df`
+        (-1 if not present), if already computed.
+
+    Returns
+    -------
+    dict
+        Variable name -> numpy.ndarray with one value per row of `df`,
+        NaN where the row's site is not in `sites` or its time is not
+        a model time (``'exact'``) or out of range
+        (or beyond `tolerance` of the model times).
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(da_interped, xr.DataArray):
+        da_interped = da_interped.to_dataset()
+    da_interped = da_interped.sortby("time")
+    model_times = da_interped["time"].values.astype("datetime64[ns]").astype(np.int64)
+    obs_times = df["time"].values.astype("datetime64[ns]").astype(np.int64)
+    nt = model_times.size
+
+    j = site_index
+    if j is None:
+        j = Index(sites["siteid"]).get_indexer(df["siteid"])
+    if method == "exact":
+        i0 = i1 = Index(model_times).get_indexer(obs_times)
+        valid = (j >= 0) & (i0 >= 0)
     else:
-        da_interped = target_data_da.monet.remap_nearest(da, **kwargs).compute()
+        i = np.searchsorted(model_times, obs_times, side="right") - 1
+        i0 = np.clip(i, 0, nt - 1)
+        i1 = np.clip(i + 1, 0, nt - 1)
+        t0, t1 = model_times[i0], model_times[i1]
+        if method == "nearest":
+            i0 = np.where(np.abs(t1 - obs_times) < np.abs(obs_times - t0), i1, i0)
+            # Within the model time range only (no extrapolation)
+            valid = (j >= 0) & (obs_times >= model_times[0]) & (obs_times <= model_times[-1])
+        elif method == "linear":
+            span = t1 - t0
+            w = np.where(span > 0, (obs_times - t0) / np.where(span > 0, span, 1), 0)
+            valid = (j >= 0) & (i >= 0) & ((i < nt - 1) | (obs_times == model_times[-1]))
+        else:
+            raise ValueError(f"time_interp must be 'nearest' or 'linear', got {method!r}")
+        if tolerance is not None:
+            dt = np.minimum(np.abs(obs_times - t0), np.abs(t1 - obs_times))
+            valid &= dt <= pd.Timedelta(tolerance).value
+    i0 = np.where(valid, i0, 0)
+    j = np.where(valid, j, 0)
+
+    out = {}
+    for name, v in da_interped.data_vars.items():
+        extra = [d for d in v.dims if d not in ["time", "x"]]
+        if any(v.sizes[d] > 1 for d in extra):
+            raise ValueError(
+                f"pairing by time and site requires (time, site) data, "
+                f"{name!r} has dims {v.dims}; select a single level first"
+            )
+        a = v.squeeze(extra).transpose("time", "x").values
+        values = a[i0, j]
+        if method == "linear":
+            # (not where w is 0, so that NaN at the next time doesn't propagate)
+            values = np.where(w > 0, values * (1 - w) + a[i1, j] * w, values)
+        out[name] = np.where(valid, values, np.nan)
+    return out
+
+
+def _interped_to_df(
+    da,
+    da_interped,
+    sites,
+    df,
+    merge=True,
+    time_interp=None,
+    time_tolerance=None,
+    site_index=None,
+):
+    """Convert `da` data interpolated to the `sites` of `df`
+    (``'x'`` dimension) to a DataFrame, optionally merged with `df`.
+
+    Merging is done by taking the model values at the (time, site)
+    position of each row of `df` (see :func:`_take_obs`),
+    falling back to a pandas merge for other data
+    (e.g. with multiple levels).
+    """
+    if merge and (time_interp is not None or _pairable(da_interped)):
+        columns = _take_obs(
+            da_interped,
+            sites,
+            df,
+            method=time_interp or "exact",
+            tolerance=time_tolerance,
+            site_index=site_index,
+        )
+        final_df = df.assign(
+            **{name + "_new" if name in df.columns else name: v for name, v in columns.items()}
+        )
+        return final_df.reset_index(drop=True)
 
-    da_interped["siteid"] = (("x"), target_da.siteid)
+    da_interped["siteid"] = (("x"), sites.siteid)
     da_interped_df = da_interped.to_dataframe().reset_index()
     cols = Series(da_interped_df.columns)
 
@@ -61,6 +276,566 @@ def combine_da_to_df(da, df, *, merge=True, **kwargs):
         return da_interped_df
 
 
+def iter_combine_files_to_df(
+    files,
+    df,
+    *,
+    variables=None,
+    open_func=None,
+    merge=True,
+    method="nearest",
+    time_interp=None,
+    time_tolerance=None,
+    **kwargs,
+):
+    """Pair model output files with point observations in dataframe `df`,
+    one file (time window) at a time.
+
+    Only one model file and the matching time slice of `df`
+    are handled at once, so memory use does not grow with the number of files.
+    The site neighbour index is computed once (see
+    :func:`~monet.util.resample.build_remapper`)
+    and reused for all files on the same grid (or unstructured mesh).
+
+    Parameters
+    ----------
+    files : str or sequence
+        Model files, in time order, or a glob pattern (sorted).
+    df : pandas.DataFrame
+        Observations, with ``'time'``, ``'siteid'``,
+        ``'latitude'`` and ``'longitude'`` columns.
+    variables : list of str, optional
+        Model variables to pair. Default: all.
+    open_func : callable, optional
+        Used to open each file,
+        returning an xarray.Dataset with a ``'time'`` dimension.
+        Default: :func:`xarray.open_dataset`.
+    merge : bool
+        Merge the interpolated model data with the `df` data.
+        Otherwise, yield interpolated model data only.
+    method : str
+        ``'nearest'`` or ``'idw'``.
+    time_interp : {None, 'nearest', 'linear'}
+        Time pairing mode, see :func:`combine_da_to_df`.
+        Interpolation is within each file's time range.
+    time_tolerance : str or pandas.Timedelta, optional
+        See :func:`combine_da_to_df`.
+    kwargs : dict
+        Passed on to :func:`~monet.util.resample.build_remapper`,
+        e.g. ``radius_of_influence``.
+        For unstructured-grid model data
+        (``'mio_has_unstructured_grid'`` attribute),
+        :meth:`~monet.monet_accessor.MONETAccessorDataset.remap_nearest_unstructured`
+        is used instead.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Paired data for the observations in the time window of each file:
+        from the first model time for the first file,
+        then after the last model time of the previous file,
+        up to the last model time of the current file.
+    """
+    df = df.sort_values("time", kind="stable")
+    sites, target, site_index = _obs_sites(df)
+
+    windows = _file_windows(
+        files, df["time"].values, target, open_func, variables, method=method, **kwargs
+    )
+    for _, ds, i0, i1, remapper in windows:
+        da_interped = remapper(ds).compute()
+        ds.close()
+
+        yield _interped_to_df(
+            ds,
+            da_interped,
+            sites,
+            df.iloc[i0:i1],
+            merge=merge,
+            time_interp=time_interp,
+            time_tolerance=time_tolerance,
+            site_index=site_index[i0:i1],
+        )
+
+
+def _file_windows(files, obs_times, target, open_func=None, variables=None, **kwargs):
+    """Open the model `files` in turn, with their observation time windows.
+
+    Parameters
+    ----------
+    files, open_func, variables
+        See :func:`iter_combine_files_to_df`.
+    obs_times : numpy.ndarray
+        Sorted observation times.
+    target : xarray.DataArray
+        Observation sites, see :func:`_obs_sites`.
+    kwargs : dict
+        Passed on to :func:`_site_remapper`.
+
+    Yields
+    ------
+    tuple
+        ``(fn, ds, i0, i1, remapper)`` for each file `fn`
+        with observations in its time window:
+        the opened Dataset `ds` (closed by the caller),
+        the range `i0`:`i1` of `obs_times` in the window
+        and the :func:`_site_remapper` of its grid
+        (built once per grid).
+    """
+    import glob
+
+    if isinstance(files, str):
+        files = sorted(glob.glob(files))
+    if open_func is None:
+        open_func = xr.open_dataset
+
+    remappers = {}
+    t_prev = None
+    for fn in files:
+        ds = open_func(fn)
+        if variables is not None:
+            ds = ds[variables]
+        model_times = ds["time"].values
+        t0, t1 = model_times.min(), model_times.max()
+        if t_prev is None:
+            i0 = obs_times.searchsorted(t0, side="left")
+        else:
+            i0 = obs_times.searchsorted(t_prev, side="right")
+        i1 = obs_times.searchsorted(t1, side="right")
+        t_prev = t1
+        if i1 <= i0:
+            ds.close()
+            continue
+        yield fn, ds, i0, i1, _site_remapper(ds, target, remappers, **kwargs)
+
+
+def _pair_file_task(
+    fn, variables, open_func, remapper, sites, obs_path, i0, i1, site_index, time_interp, tolerance
+):
+    """Pair one model file (and variable group) with observation rows `i0`:`i1`.
+
+    Run in a worker of :func:`_iter_combine_files_parallel`.
+    The observation times are read from the memory-mapped Arrow file
+    `obs_path`, so that only the row range and `site_index` are sent over.
+    Returns the model columns (see :func:`_take_obs`).
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    with pa.memory_map(obs_path) as source:
+        times = pa.ipc.open_file(source).read_all().column("time").slice(i0, i1 - i0)
+        obs = pd.DataFrame({"time": times.to_numpy()})
+
+    if open_func is None:
+        open_func = xr.open_dataset
+    ds = open_func(fn)
+    if variables is not None:
+        ds = ds[variables]
+    # Parallelism is across tasks, so don't oversubscribe the workers with dask threads
+    da_interped = remapper(ds).compute(scheduler="synchronous")
+    ds.close()
+
+    return _take_obs(
+        da_interped,
+        sites,
+        obs,
+        method=time_interp or "exact",
+        tolerance=tolerance,
+        site_index=site_index,
+    )
+
+
+def _iter_combine_files_parallel(
+    files,
+    df,
+    *,
+    executor="process",
+    max_workers=None,
+    variables=None,
+    split_variables=False,
+    open_func=None,
+    method="nearest",
+    time_interp=None,
+    time_tolerance=None,
+    **kwargs,
+):
+    """Parallel version of :func:`iter_combine_files_to_df`,
+    with one task per file (and per variable if `split_variables`).
+
+    The sites, site index and neighbours (one remapper per distinct grid)
+    are computed once here.
+    Tasks get the remapper, their observation row range and site index slice;
+    the observation times are shared through a memory-mapped Arrow file.
+    Results are yielded in file order,
+    with at most twice the number of workers files in flight
+    (a file is submitted once an earlier one has been yielded).
+    """
+    import collections
+    import os
+    import shutil
+    import tempfile
+    from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+    import pyarrow as pa
+
+    if isinstance(executor, Executor):
+        pool, own_pool = executor, False
+    elif executor == "process":
+        pool, own_pool = ProcessPoolExecutor(max_workers), True
+    elif executor == "thread":
+        pool, own_pool = ThreadPoolExecutor(max_workers), True
+    else:
+        raise ValueError(f"executor must be 'process', 'thread' or an Executor, got {executor!r}")
+
+    df = df.sort_values("time", kind="stable")
+    obs_times = df["time"].values
+    sites, target, site_index = _obs_sites(df)
+
+    # Files in flight, so that finished results don't pile up ahead of the consumer
+    workers = max_workers or getattr(pool, "_max_workers", None) or os.cpu_count() or 1
+    jobs = collections.deque()
+
+    def collect(job):
+        i0, i1, futures = job
+        columns = {}
+        for future in futures:
+            columns.update(future.result())
+        obs = df.iloc[i0:i1]
+        return obs.assign(
+            **{name + "_new" if name in obs.columns else name: v for name, v in columns.items()}
+        ).reset_index(drop=True)
+
+    tmpdir = tempfile.mkdtemp(prefix="monet-pairing-")
+    obs_path = os.path.join(tmpdir, "obs.arrow")
+    try:
+        table = pa.table({"time": obs_times})
+        with pa.OSFile(obs_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        # Time windows and remappers, from the file metadata only
+        windows = _file_windows(
+            files, obs_times, target, open_func, variables, method=method, **kwargs
+        )
+        for fn, ds, i0, i1, remapper in windows:
+            names = list(ds.data_vars)
+            ds.close()
+
+            groups = [[name] for name in names] if split_variables else [names]
+            futures = [
+                pool.submit(
+                    _pair_file_task,
+                    fn,
+                    group,
+                    open_func,
+                    remapper,
+                    sites[["siteid", "latitude", "longitude"]],
+                    obs_path,
+                    i0,
+                    i1,
+                    site_index[i0:i1],
+                    time_interp,
+                    time_tolerance,
+                )
+                for group in groups
+            ]
+            jobs.append((i0, i1, futures))
+            if len(jobs) >= 2 * workers:
+                yield collect(jobs.popleft())
+
+        while jobs:
+            yield collect(jobs.popleft())
+    finally:
+        for _, _, futures in jobs:
+            for future in futures:
+                future.cancel()
+        if own_pool:
+            pool.shutdown()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def combine_files_to_df(files, df, *, path=None, executor=None, max_workers=None, **kwargs):
+    """Pair model output files with point observations in dataframe `df`,
+    one file at a time (see :func:`iter_combine_files_to_df`),
+    collecting the results in a single DataFrame
+    or appending them to a file.
+
+    Parameters
+    ----------
+    files : str or sequence
+        Model files, in time order, or a glob pattern.
+    df : pandas.DataFrame
+        Observations.
+    path : str or path-like, optional
+        If provided, each paired chunk is appended to this file
+        (Parquet for a ``.parquet`` extension, otherwise CSV)
+        instead of being kept in memory.
+    executor : {None, 'process', 'thread'} or concurrent.futures.Executor
+        Pair the files in parallel in a process or thread pool
+        (or the given executor).
+        The observation table is not sent to the workers:
+        they get the precomputed site index and neighbours,
+        and read the observation times from a memory-mapped Arrow file.
+        Model data must be on a single level (or unstructured),
+        `open_func` must be picklable for processes
+        and `merge` must be True.
+        Pass ``split_variables=True`` to also split each file by variable.
+    max_workers : int, optional
+        Pool size, for `executor` ``'process'`` or ``'thread'``.
+        Default: the number of CPUs.
+        At most twice this number of files are paired ahead of
+        the results being written out (or collected).
+    kwargs : dict
+        Passed on to :func:`iter_combine_files_to_df`.
+
+    Returns
+    -------
+    pandas.DataFrame or None
+        The paired data, or None if `path` is provided.
+    """
+    import pandas as pd
+
+    if executor is None:
+        chunks = iter_combine_files_to_df(files, df, **kwargs)
+    elif not kwargs.pop("merge", True):
+        raise ValueError(
+            "merge=False is not supported with an executor, "
+            "which pairs model values into the observation rows; use executor=None"
+        )
+    else:
+        chunks = _iter_combine_files_parallel(
+            files, df, executor=executor, max_workers=max_workers, **kwargs
+        )
+    if path is None:
+        chunks = list(chunks)
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+    if str(path).endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(path, mode="w" if header else "a", header=header, index=False)
+            header = False
+
+
+def _prepare_paired_chunk(df, downcast=True):
+    """Add the ``'date'`` partition column to paired data `df`,
+    store site IDs as categorical
+    and (if `downcast`) floats as float32, keeping float64 coordinates."""
+    import numpy as np
+
+    out = df.assign(date=df["time"].dt.strftime("%Y-%m-%d"))
+    if "siteid" in out.columns:
+        out["siteid"] = out["siteid"].astype(str).astype("category")
+    if downcast:
+        for name in out.columns:
+            if out[name].dtype == np.float64 and name not in ["latitude", "longitude"]:
+                out[name] = out[name].astype(np.float32)
+    return out
+
+
+def write_paired_parquet(
+    chunks, path, *, partition_cols=("date", "variable"), downcast=True, mode="append"
+):
+    """Write paired data to a Hive-partitioned Parquet dataset,
+    one chunk at a time.
+
+    Parameters
+    ----------
+    chunks : pandas.DataFrame or iterable of pandas.DataFrame
+        Paired data, with a ``'time'`` column,
+        e.g. from :func:`combine_da_to_df`
+        or :func:`iter_combine_files_to_df`.
+    path : str or path-like
+        Dataset directory.
+    partition_cols : sequence of str
+        Partition columns, out of ``'date'``
+        (``YYYY-MM-DD`` of ``'time'``, added)
+        and the data columns.
+        Columns not in the data (e.g. ``'variable'`` for wide data) are skipped.
+    downcast : bool
+        Store float columns as float32
+        (``'latitude'`` and ``'longitude'`` are kept as float64).
+        Site IDs are always stored as categorical (dictionary-encoded).
+    mode : {'append', 'overwrite'}
+        ``'append'`` adds new files to the dataset,
+        for incremental (e.g. daily) runs.
+        ``'overwrite'`` first removes the existing data
+        of the partitions written to (e.g. to re-run a day).
+
+    See Also
+    --------
+    read_paired_parquet
+    """
+    import os
+    import shutil
+    import uuid
+
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+
+    if mode not in ["append", "overwrite"]:
+        raise ValueError(f"mode must be 'append' or 'overwrite', got {mode!r}")
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+
+    path = os.fspath(path)
+    written = set()
+    for i, chunk in enumerate(chunks):
+        if len(chunk) == 0:
+            continue
+        chunk = _prepare_paired_chunk(chunk, downcast=downcast)
+        cols = [c for c in partition_cols if c in chunk.columns]
+        if mode == "overwrite":
+            for key in chunk[cols].drop_duplicates().itertuples(index=False):
+                part = os.path.join(path, *(f"{c}={v}" for c, v in zip(cols, key)))
+                if part not in written:
+                    shutil.rmtree(part, ignore_errors=True)
+                    written.add(part)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        pads.write_dataset(
+            table,
+            path,
+            format="parquet",
+            partitioning=pads.partitioning(table.select(cols).schema, flavor="hive"),
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+
+def read_paired_parquet(path, *, sites=None, start=None, end=None, variables=None, columns=None):
+    """Read paired data written by :func:`write_paired_parquet`.
+
+    The filters are pushed down to the Parquet reader:
+    date and variable partitions outside of the selection are not read,
+    and row groups are skipped using their statistics.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Dataset directory.
+    sites : list of str, optional
+        Site IDs to read.
+    start, end : str or datetime-like, optional
+        Time range to read (inclusive).
+    variables : list of str, optional
+        Values of the ``'variable'`` column (partition) to read.
+    columns : list of str, optional
+        Columns to read. Default: all.
+
+    Returns
+    -------
+    pandas.DataFrame
+        With categorical ``'siteid'``.
+    """
+    import os
+
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+
+    dataset = pads.dataset(os.fspath(path), format="parquet", partitioning="hive")
+    names = dataset.schema.names
+
+    filters = []
+    if sites is not None:
+        filters.append(pads.field("siteid").isin([str(s) for s in sites]))
+    for bound, op in [(start, "ge"), (end, "le")]:
+        if bound is None:
+            continue
+        t = pd.Timestamp(bound)
+        value = pa.scalar(t.to_datetime64(), type=dataset.schema.field("time").type)
+        filters.append(getattr(pads.field("time"), f"__{op}__")(value))
+        if "date" in names:
+            day = t.strftime("%Y-%m-%d")
+            filters.append(getattr(pads.field("date"), f"__{op}__")(day))
+    if variables is not None:
+        filters.append(pads.field("variable").isin(list(variables)))
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+
+    if columns is None:
+        columns = [c for c in names if c != "date"]
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+
+def combine_models_to_df(
+    models, df, *, method="nearest", time_interp=None, time_tolerance=None, **kwargs
+):
+    """Pair several models with point observations in dataframe `df` at once.
+
+    The observation sites are set up once,
+    the neighbour search is done once per distinct model grid
+    (models on identical grids share it),
+    and all model values are written into the observation frame together.
+
+    Parameters
+    ----------
+    models : dict
+        Model name -> xarray.DataArray or xarray.Dataset,
+        with time and horizontal dims only (select a level first).
+        Can be unstructured-grid data
+        (detected by checking ``'mio_has_unstructured_grid'`` attribute),
+        of which the first level is paired.
+    df : pandas.DataFrame
+        Observations, with ``'time'``, ``'siteid'``,
+        ``'latitude'`` and ``'longitude'`` columns.
+    method : str
+        ``'nearest'`` or ``'idw'``.
+    time_interp : {None, 'nearest', 'linear'}
+        Time pairing mode, see :func:`combine_da_to_df`.
+    time_tolerance : str or pandas.Timedelta, optional
+        See :func:`combine_da_to_df`.
+    kwargs : dict
+        Passed on to :func:`~monet.util.resample.build_remapper`,
+        e.g. ``radius_of_influence``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `df` with a column ``'<variable>_<model name>'``
+        for each variable of each model.
+    """
+    sites, target, site_index = _obs_sites(df)
+
+    remappers = {}
+    columns = {}
+    for model_name, da in models.items():
+        da_interped = _site_remapper(da, target, remappers, method=method, **kwargs)(da).compute()
+        extra = {d: n for d, n in da_interped.sizes.items() if d not in ["time", "x"] and n > 1}
+        if extra:
+            raise ValueError(
+                f"combine_models_to_df pairs (time, site) data only, model {model_name!r} "
+                f"has extra dims {extra}; select a single level first "
+                "or use combine_da_to_df, which merges multi-level data"
+            )
+        paired = _take_obs(
+            da_interped,
+            sites,
+            df,
+            method=time_interp or "exact",
+            tolerance=time_tolerance,
+            site_index=site_index,
+        )
+        columns.update({f"{name}_{model_name}": v for name, v in paired.items()})
+
+    return df.assign(**columns).reset_index(drop=True)
+
+
 def combine_da_to_da(source, target, *, merge=True, interp_time=False, **kwargs):
     """Combine xarray data array `source` with with point observations
     in second data array `target`, returning a new xarray object.
@@ -106,7 +881,89 @@ def _rename_latlon(ds):
         return ds
 
 
-def combine_da_to_df_xesmf(da, df, *, suffix=None, **kwargs):
+class SiteTable:
+    """Unique observation sites of a DataFrame,
+    for positional pairing of model data with the observations.
+
+    Built once, a site table can be reused across calls
+    (e.g. :func:`combine_da_to_df_xesmf` for successive observation files),
+    keeping the xESMF site target (:attr:`target`)
+    and thus its regridding weights (see
+    :class:`~monet.util.resample.XESMFWeightCache`) unchanged.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Observations, with ``'latitude'`` and ``'longitude'`` columns.
+    by : str or list of str, optional
+        Column(s) identifying a site.
+        Default: ``'siteid'`` if present, else latitude and longitude.
+    decimals : int
+        Latitude and longitude are rounded to this many decimals
+        when used to identify sites,
+        so that coordinates differing in the last digits
+        give the same site.
+
+    Attributes
+    ----------
+    keys : pandas.Index
+        Site identifiers.
+    latitude, longitude : numpy.ndarray
+        Site coordinates (of the first row of each site).
+    codes : numpy.ndarray
+        Position in :attr:`keys` of the site of each row of `df`,
+        -1 for rows with missing coordinates.
+    """
+
+    def __init__(self, df, by=None, decimals=4):
+        import numpy as np
+
+        if by is None:
+            by = "siteid" if "siteid" in df.columns else ["latitude", "longitude"]
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.decimals = decimals
+        ok = df["latitude"].notna().values & df["longitude"].notna().values
+        row_keys = self._row_keys(df)
+        self.keys = row_keys[ok].unique()
+        self.codes = np.where(ok, self.keys.get_indexer(row_keys), -1)
+        first = np.unique(self.codes[ok], return_index=True)[1]
+        self.latitude = df["latitude"].values[ok][first]
+        self.longitude = df["longitude"].values[ok][first]
+        self._target = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _row_keys(self, df):
+        from pandas import MultiIndex
+
+        keys = df[self.by]
+        rounded = [c for c in self.by if c in ["latitude", "longitude"]]
+        if rounded:
+            keys = keys.round({c: self.decimals for c in rounded})
+        if len(self.by) == 1:
+            return Index(keys[self.by[0]])
+        return MultiIndex.from_frame(keys)
+
+    def get_indexer(self, df):
+        """Position in :attr:`keys` of the site of each row of `df`
+        (-1 if not in the table).
+        """
+        return self.keys.get_indexer(self._row_keys(df))
+
+    @property
+    def target(self):
+        """xESMF locstream-like target Dataset of the sites
+        (``x`` dimension for the sites).
+        """
+        from .interp_util import constant_1d_xesmf
+
+        if self._target is None:
+            self._target = constant_1d_xesmf(longitude=self.longitude, latitude=self.latitude)
+        return self._target
+
+
+def combine_da_to_df_xesmf(da, df, *, suffix=None, sites=None, **kwargs):
     """Combine xarray data array `da` with spatial information
     point observations in dataframe `df`, returning a new dataframe.
 
@@ -120,6 +977,10 @@ def combine_da_to_df_xesmf(da, df, *, suffix=None, **kwargs):
         Data on target points.
     suffix : str, optional
         Added to the ``name`` of the new variable, defaults to ``'_new'``.
+    sites : SiteTable, optional
+        Sites to interpolate to, containing those of `df`.
+        Default: built from `df`.
+        Pass one to reuse the same target (and weights) across calls.
     kwargs : dict
         Passed on to :func:`~monet.util.resample.resample_xesmf`
         (and then to ``xesmf.Regridder``).
@@ -128,42 +989,41 @@ def combine_da_to_df_xesmf(da, df, *, suffix=None, **kwargs):
     -------
     pandas.DataFrame
     """
-    from ..util.interp_util import constant_1d_xesmf
     from ..util.resample import resample_xesmf
 
-    # dfn = df.dropna(subset=[col])
-    dfnn = df.drop_duplicates(subset=["latitude", "longitude"])
-    # unit = dfnn[col + '_unit'].unique()[0]
-    # target_grid = lonlat_to_swathdefinition(
-    #     longitude=dfnn.longitude.values, latitude=dfnn.latitude.values)
-    target = constant_1d_xesmf(longitude=dfnn.longitude.values, latitude=dfnn.latitude.values)
+    if sites is None:
+        sites = SiteTable(df)
+        codes = sites.codes
+    else:
+        codes = sites.get_indexer(df)
 
     da = _rename_latlon(da)  # check to rename latitude and longitude
-    da_interped = resample_xesmf(da, target, **kwargs)
+    da_interped = resample_xesmf(da, sites.target, **kwargs)
     da_interped = _rename_latlon(da_interped)  # check to change back
     if suffix is None:
         suffix = "_new"
-    rename_dict = {}
+
+    if _pairable(da_interped):
+        columns = _take_obs(da_interped, None, df, site_index=codes)
+        final_df = df.assign(
+            **{name + suffix if name in df.columns else name: v for name, v in columns.items()}
+        )
+        return final_df.reset_index(drop=True)
+
+    # E.g. multiple levels: merge on site position and time
     if isinstance(da_interped, xr.DataArray):
-        if da_interped.name in dfnn.keys():
-            da_interped.name = da_interped.name + suffix
-    else:
-        for i in da_interped.data_vars.keys():
-            if i in dfnn.keys():
-                rename_dict[i] = i + suffix
-        da_interped = da_interped.rename(rename_dict)
-    df_interped = da_interped.to_dataframe().reset_index()
+        da_interped = da_interped.to_dataset()
+    da_interped = da_interped.rename(
+        {name: name + suffix for name in da_interped.data_vars if name in df.columns}
+    )
+    df_interped = da_interped.assign_coords(x=range(len(sites))).to_dataframe().reset_index()
     cols = Series(df_interped.columns)
-    drop_cols = cols.loc[cols.isin(["x", "y", "z"])]
-    df_interped.drop(drop_cols, axis=1, inplace=True)
-
-    # if da.name in df.columns:
-    #     df_interped.rename(columns={da.name: da.name + '_new'}, inplace=True)
-    # print(df_interped.keys())
-    final_df = df.merge(
-        df_interped, on=["latitude", "longitude", "time"], how="left", suffixes=("", suffix)
+    drop_cols = cols.loc[cols.isin(["y", "z", "latitude", "longitude"])]
+    df_interped = df_interped.drop(drop_cols, axis=1).rename(columns={"x": "monet_site_index"})
+    final_df = df.assign(monet_site_index=codes).merge(
+        df_interped, on=["monet_site_index", "time"], how="left"
     )
-    return final_df
+    return final_df.drop(columns="monet_site_index")
 
 
 def combine_da_to_df_xesmf_strat(da, daz, df, **kwargs):
@@ -186,6 +1046,10 @@ def combine_da_to_df_xesmf_strat(da, daz, df, **kwargs):
     Returns
     -------
     pandas.DataFrame
+
+    See Also
+    --------
+    combine_da_to_df_track : per-point interpolation, for large tracks
     """
     from ..util.interp_util import constant_1d_xesmf
     from ..util.resample import resample_xesmf
@@ -237,29 +1101,414 @@ def combine_da_to_df_xesmf_strat(da, daz, df, **kwargs):
     return final_df
 
 
-def combine_da_to_height_profile(da, dset, *, radius_of_influence=12e3):
-    """This function will combine an xarray.DataArray to a 2d dataset with
-    dimensions (time,z)
+def _interp_columns(zp, vp, target):
+    """Linear interpolation of profiles `vp` on vertical coordinate `zp`
+    (same shape, levels along the last axis, increasing or decreasing)
+    to `target` (shape without the level axis), with vectorized bracketing.
+    Values beyond the ends of a profile are those of the end level.
+    """
+    import numpy as np
+
+    nz = zp.shape[-1]
+    t = target[..., np.newaxis]
+    increasing = zp[..., -1:] >= zp[..., :1]
+    n = np.where(increasing, zp <= t, zp >= t).sum(axis=-1)
+    lo = np.clip(n - 1, 0, nz - 1)[..., np.newaxis]
+    hi = np.clip(n, 0, nz - 1)[..., np.newaxis]
+    z_lo = np.take_along_axis(zp, lo, axis=-1)[..., 0]
+    z_hi = np.take_along_axis(zp, hi, axis=-1)[..., 0]
+    v_lo = np.take_along_axis(vp, lo, axis=-1)[..., 0]
+    v_hi = np.take_along_axis(vp, hi, axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(z_hi != z_lo, (target - z_lo) / (z_hi - z_lo), 0)
+    out = np.where(w > 0, v_lo + w * (v_hi - v_lo), v_lo)
+    return np.where(np.isnan(target), np.nan, out)
+
+
+def _take_columns(da, daz, keys, grid_shape, v, z):
+    """Fill `v` and `z` with the (time, level, grid...) `da` and `daz` columns
+    at the sorted flat (time, grid cell) `keys`.
+
+    For each time, only the box of the grid spanning its cells is read
+    (a pointwise vectorized read is much slower with netCDF backends),
+    so memory use stays within one time step.
+    """
+    import numpy as np
+
+    ncell = int(np.prod(grid_shape))
+    times, starts = np.unique(keys // ncell, return_index=True)
+    for t, lo, hi in zip(times, starts, list(starts[1:]) + [keys.size]):
+        cells = np.unravel_index(keys[lo:hi] % ncell, grid_shape)
+        box = tuple(slice(c.min(), c.max() + 1) for c in cells)
+        at = tuple(c - c.min() for c in cells)
+        for a, out in [(da, v), (daz, z)]:
+            values = a[(int(t), slice(None)) + box].values
+            out[lo:hi] = values[(slice(None),) + at].T
+
+
+def combine_da_to_df_track(
+    da,
+    daz,
+    df,
+    *,
+    altitude="altitude",
+    method="nearest",
+    neighbours=4,
+    radius_of_influence=None,
+    suffix="_new",
+    batch_size=100_000,
+):
+    """Interpolate 4-D model data `da` to the (time, altitude, latitude, longitude)
+    of each point of a track (e.g. aircraft or sonde observations) in `df`.
+
+    Unlike :func:`combine_da_to_df_xesmf_strat`,
+    model data is only interpolated at each point's own position and time:
+    horizontally (nearest or inverse-distance weighted neighbours),
+    then linearly in the vertical (using `daz`),
+    then linearly in time between the bracketing model times.
+    Points are processed in batches (ordered by time),
+    reading only the model columns at the points' neighbour cells
+    and bracketing times (one time step at a time),
+    so memory use is proportional to the number of points,
+    not to the model field size.
 
     Parameters
     ----------
     da : xarray.DataArray
+        Model data with dims time, a vertical dim, and the horizontal grid dims
+        (MONET latitude/longitude, see :func:`monet.dataset_to_monet`).
+        Its name is used for the new column.
+    daz : xarray.DataArray
+        Vertical coordinate of `da` (e.g. layer height), same shape,
+        in the units of the `altitude` column.
+        Profiles may be increasing or decreasing.
+    df : pandas.DataFrame
+        Track points, with ``'time'``, ``'latitude'``, ``'longitude'``
+        and `altitude` columns.
+    altitude : str
+        Name of the `df` vertical coordinate column.
+        Points beyond the model column get the value of the nearest end level.
+    method : {'nearest', 'idw'}
+        Horizontal interpolation.
+    neighbours : int
+        Number of neighbours for ``'idw'``.
+    radius_of_influence : float, optional
+        Maximum great-circle distance (m) to a model grid cell center.
+    suffix : str
+        Added to the name of `da` if it is already a column of `df`.
+    batch_size : int
+        Number of points processed at once.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `df` with the interpolated model data added as a new column,
+        NaN for points out of range in time or space.
+    """
+    import numpy as np
+
+    from ..monet_accessor import _dataset_to_monet, _get_lonlat_index
+    from .resample import _idw_weights
+
+    if da.shape != daz.shape:
+        raise ValueError(f"da and daz must be of the same shape, got {da.shape} and {daz.shape}")
+    if da.name is None:
+        raise ValueError("da must be named (da.name), for the name of the new column")
+    name = da.name if da.name not in df.columns else da.name + suffix
+    index = _get_lonlat_index(da.monet)
+    da = _dataset_to_monet(da)
+    daz = _dataset_to_monet(daz)
+    grid_dims = da.latitude.dims
+    zdims = [d for d in da.dims if d != "time" and d not in grid_dims]
+    if len(zdims) != 1:
+        raise ValueError(f"da must have one vertical dim besides time and {grid_dims}")
+    dims = ("time", zdims[0]) + tuple(grid_dims)
+    da, daz = da.transpose(*dims), daz.transpose(*dims)
+    nt, nz = da.shape[:2]
+
+    # Horizontal neighbours and weights
+    k = neighbours if method == "idw" else 1
+    distance, cell = index.query(
+        df["longitude"].values, df["latitude"].values, k=k, radius_of_influence=radius_of_influence
+    )
+    distance, cell = distance.reshape(len(df), k), cell.reshape(len(df), k)
+    if method == "idw":
+        w_h = _idw_weights(distance)
+    elif method == "nearest":
+        w_h = (cell >= 0).astype(float)
+    else:
+        raise ValueError(f"method must be 'nearest' or 'idw', got {method!r}")
+    cell = np.where(cell >= 0, cell, 0)
+
+    # Bracketing model times
+    model_times = da["time"].values.astype("datetime64[ns]").astype(np.int64)
+    obs_times = df["time"].values.astype("datetime64[ns]").astype(np.int64)
+    i = np.searchsorted(model_times, obs_times, side="right") - 1
+    i0 = np.clip(i, 0, nt - 1)
+    i1 = np.clip(i + 1, 0, nt - 1)
+    span = model_times[i1] - model_times[i0]
+    w_t = np.where(span > 0, (obs_times - model_times[i0]) / np.where(span > 0, span, 1), 0)
+    valid = (i >= 0) & ((i < nt - 1) | (obs_times == model_times[-1]))
+
+    alt = df[altitude].values.astype(float)
+    grid_shape = da.shape[2:]
+    ncell = int(np.prod(grid_shape))
+    out = np.full(len(df), np.nan)
+    order = np.flatnonzero(valid)
+    order = order[np.argsort(i0[order], kind="stable")]
+    for start in range(0, order.size, batch_size):
+        sel = order[start : start + batch_size]
+        # Model columns needed by the batch: unique (bracketing time, neighbour cell) pairs
+        keys = np.stack([i0[sel], i1[sel]])[:, :, np.newaxis] * ncell + cell[sel]
+        ukeys, inverse = np.unique(keys.ravel(), return_inverse=True)
+        inverse = inverse.reshape(keys.shape)
+        v = np.empty((ukeys.size, nz))
+        z = np.empty((ukeys.size, nz))
+        _take_columns(da, daz, ukeys, grid_shape, v, z)
+        result = np.zeros(sel.size)
+        for cols, wti in [(inverse[0], 1 - w_t[sel]), (inverse[1], w_t[sel])]:
+            vi = _interp_columns(z[cols], v[cols], alt[sel, np.newaxis])
+            wh = np.where(np.isnan(vi), 0, w_h[sel])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                vh = (np.where(wh > 0, vi, 0) * wh).sum(axis=-1) / wh.sum(axis=-1)
+            result += np.where(wti > 0, wti * vh, 0)
+        out[sel] = result
+
+    return df.assign(**{name: out})
+
+
+def iter_combine_da_to_swath(
+    da,
+    granules,
+    *,
+    time_tolerance="1h",
+    averaging_kernel=None,
+    open_func=None,
+    radius_of_influence=None,
+    suffix="_new",
+):
+    """Pair model data `da` with satellite swath (L2) granules,
+    one granule at a time.
+
+    Each pixel is mapped to the nearest model grid cell
+    (KD-tree on the model grid, cached on `da`'s accessor)
+    and to the model time nearest its observation time.
+    Only the model times needed by the current granule are loaded.
+
+    Parameters
+    ----------
+    da : xarray.DataArray
+        Model data with dims time, optionally a vertical dim,
+        and the horizontal grid dims (no other dims).
+        Its name is used for the new variable.
+    granules : str, xarray.Dataset, or sequence
+        Granule Datasets or files, or a glob pattern (sorted).
+        Each has per-pixel ``'latitude'``, ``'longitude'``
+        and ``'time'`` (broadcastable to the pixel dims, e.g. per scanline).
+    time_tolerance : str or pandas.Timedelta
+        Maximum time difference between a pixel and its model time.
+    averaging_kernel : str, optional
+        Name of a granule variable with dims (pixel dims..., level),
+        the levels corresponding to those of `da`.
+        If provided, the model profile of each pixel
+        is reduced with its averaging kernel (sum over levels)
+        in one batched einsum.
+        Otherwise the model profile (or value) is returned.
+    open_func : callable, optional
+        Used to open granule files. Default: :func:`xarray.open_dataset`.
+        Granules opened from files are loaded into memory and closed
+        before being yielded;
+        granule Datasets passed in are left to the caller to close.
+    radius_of_influence : float, optional
+        Maximum distance (m) between a pixel and the model grid cell center.
+    suffix : str
+        Added to the name of `da` if already a variable of the granule.
+
+    Yields
+    ------
+    xarray.Dataset
+        Each granule, with the paired model data added
+        (NaN for pixels without model data).
+    """
+    import glob
+
+    import numpy as np
+    from pandas import Timedelta
+
+    from ..monet_accessor import _dataset_to_monet, _get_lonlat_index
+
+    if isinstance(granules, str):
+        granules = sorted(glob.glob(granules))
+    elif isinstance(granules, xr.Dataset):
+        granules = [granules]
+    if open_func is None:
+        open_func = xr.open_dataset
+
+    if da.name is None:
+        raise ValueError("da must be named (da.name), for the name of the new variable")
+    index = _get_lonlat_index(da.monet)
+    name = da.name
+    da = _dataset_to_monet(da)
+    grid_dims = tuple(da.latitude.dims)
+    zdims = [d for d in da.dims if d != "time" and d not in grid_dims]
+    if len(zdims) > 1:
+        raise ValueError(
+            f"da must have at most one vertical dim besides time and {grid_dims}, "
+            f"got extra dims {zdims}; select along the others first"
+        )
+    da = da.transpose("time", *zdims, *grid_dims)
+    level_shape = da.shape[1 : 1 + len(zdims)]
+    ncell = int(np.prod(index.shape))
+    model_times = da["time"].values.astype("datetime64[ns]").astype(np.int64)
+    nt = model_times.size
+    tolerance = Timedelta(time_tolerance).value
+
+    for g in granules:
+        if not isinstance(g, xr.Dataset):
+            # Load the granule so that its file can be closed right away
+            src = open_func(g)
+            try:
+                g = src.load()
+            finally:
+                src.close()
+        pixel_dims = g["latitude"].dims
+        _, cell = index.query(
+            g["longitude"].values, g["latitude"].values, radius_of_influence=radius_of_influence
+        )
+        times = g["time"].broadcast_like(g["latitude"]).transpose(*pixel_dims).values
+        times = times.astype("datetime64[ns]").astype(np.int64)
+        i = np.clip(np.searchsorted(model_times, times), 0, nt - 1)
+        prev = np.maximum(i - 1, 0)
+        i = np.where(np.abs(model_times[prev] - times) <= np.abs(model_times[i] - times), prev, i)
+        ok = (cell >= 0) & (np.abs(model_times[i] - times) <= tolerance)
+
+        # Load only the model times used by this granule
+        used, inverse = np.unique(i[ok], return_inverse=True)
+        model = da.isel(time=used).values.reshape((used.size,) + level_shape + (ncell,))
+        if zdims:
+            profiles = np.moveaxis(model, -1, 1)[inverse, cell[ok]]  # (pixel, level)
+        else:
+            profiles = model[inverse, cell[ok]]
+
+        out_name = name + suffix if name in g.variables else name
+        if averaging_kernel is not None:
+            ak = g[averaging_kernel].transpose(*pixel_dims, ...)
+            if ak.shape[len(pixel_dims) :] != level_shape:
+                raise ValueError(
+                    f"averaging kernel levels {ak.shape[len(pixel_dims) :]} "
+                    f"do not match model levels {level_shape}"
+                )
+            values = np.einsum("pk,pk->p", ak.values[ok], profiles)
+            dims = pixel_dims
+        else:
+            values = profiles
+            dims = pixel_dims + tuple(zdims)
+        out = np.full(cell.shape + values.shape[1:], np.nan)
+        out[ok] = values
+        yield g.assign({out_name: (dims, out)})
+
+
+def combine_da_to_height_profile(
+    da, dset, *, daz=None, height="z", radius_of_influence=12e3, max_elements=50_000_000
+):
+    """Interpolate model data `da` to the height bins of profiling instruments
+    (e.g. wind profilers, lidars) at one or more sites, adding it to `dset`.
+
+    The model columns at all sites are extracted in one indexed gather
+    (nearest grid cell, see :class:`~monet.util.interp_util.LonLatIndex`)
+    and interpolated linearly to the instrument heights,
+    vectorized over time and sites.
+
+    Parameters
+    ----------
+    da : xarray.DataArray
+        Model data with dims time, a vertical dim,
+        and the horizontal grid dims.
     dset : xarray.Dataset
+        Profile data with dims (time, site, z), or (time, z) for a single site,
+        and ``'latitude'``/``'longitude'`` coordinates (per site).
+    daz : xarray.DataArray, optional
+        Height of the `da` levels (same shape as `da`),
+        in the units of ``dset[height]``.
+        Default: the coordinate of the vertical dim of `da`.
+    height : str
+        Name of the `dset` height variable,
+        with dims (z,) or (site, z).
+    radius_of_influence : float
+        Maximum distance (m) between a site and the model grid cell center.
+        Sites without a model cell within this distance get NaN.
+    max_elements : int
+        Bounds the temporary arrays of the vertical interpolation
+        (number of elements); time is processed in blocks accordingly.
 
     Returns
     -------
     xarray.Dataset
-        Returns the xarray.Dataset with the `da` added as an additional
-        variable.
+        `dset` with `da` (interpolated, dims as `dset`) added
+        as an additional variable.
+        Model times that are not in `dset` are dropped
+        and `dset` times not in the model get NaN.
     """
-    # from ..util.interp_util import nearest_point_swathdefinition
-    lon, lat = dset.longitude, dset.latitude
-    # target_grid = nearest_point_swathdefinition(longitude=lon, latitude=lat)
-    da_interped = da.monet.nearest_latlon(lon=lon, lat=lat, radius_of_influence=radius_of_influence)
+    import numpy as np
+
+    from ..monet_accessor import _dataset_to_monet, _get_lonlat_index
+
+    index = _get_lonlat_index(da.monet)
+    da = _dataset_to_monet(da)
+    grid_dims = da.latitude.dims
+    zdims = [d for d in da.dims if d != "time" and d not in grid_dims]
+    if len(zdims) != 1:
+        raise ValueError(f"da must have one vertical dim besides time and {grid_dims}")
+    zdim = zdims[0]
+    if daz is None:
+        if zdim not in da.coords:
+            raise ValueError("daz (model level heights) is required")
+        daz = da[zdim].broadcast_like(da)
+    else:
+        daz = _dataset_to_monet(daz)
+    dims = ("time", zdim) + tuple(grid_dims)
+    da, daz = da.transpose(*dims), daz.transpose(*dims)
 
-    # FIXME: interp to height here
+    single_site = dset["latitude"].ndim == 0
+    site_dim = "site" if single_site else dset["latitude"].dims[0]
+    lat = np.atleast_1d(dset["latitude"].values)
+    lon = np.atleast_1d(dset["longitude"].values)
+    _, cell = index.query(lon, lat, radius_of_influence=radius_of_influence)
+    found = cell >= 0
+    iy, ix = np.unravel_index(np.where(found, cell, 0), index.shape)
 
-    dset[da.name] = da_interped
+    # Model columns at all sites: (time, site, level)
+    indexers = {
+        grid_dims[0]: xr.DataArray(iy, dims=site_dim),
+        grid_dims[1]: xr.DataArray(ix, dims=site_dim),
+    }
+    columns = da.isel(indexers).transpose("time", site_dim, zdim).values
+    heights = daz.isel(indexers).transpose("time", site_dim, zdim).values
+
+    h = dset[height]
+    obs_zdim = h.dims[-1]
+    h = np.broadcast_to(h.transpose(..., obs_zdim).values, (lat.size, h.shape[-1]))
+    nt, ns, nzm = columns.shape
+    nzo = h.shape[-1]
+    out = np.full((nt, ns, nzo), np.nan)
+    step = max(1, max_elements // (ns * nzo * nzm))
+    for t0 in range(0, nt, step):
+        t = slice(t0, t0 + step)
+        out[t] = _interp_columns(
+            heights[t, :, np.newaxis, :], columns[t, :, np.newaxis, :], h[np.newaxis]
+        )
+    out[:, ~found] = np.nan
+
+    result = xr.DataArray(
+        out,
+        dims=("time", site_dim, obs_zdim),
+        coords={"time": da["time"].values},
+        name=da.name,
+        attrs=da.attrs.copy(),
+    )
+    if single_site:
+        result = result.squeeze(site_dim, drop=True)
+    dset[da.name] = result
 
     return dset
 
@@ -1,6 +1,170 @@
 """ Interpolation functions """
 
 
+def _hash_arrays(*arrays, **params):
+    """Content hash of a set of arrays (and optional scalar parameters).
+
+    Used to key caches of grid-dependent results (neighbour info,
+    spatial indices, weights) so that they can be reused across calls
+    with identical geometry.
+
+    Parameters
+    ----------
+    *arrays : array-like
+        Arrays to hash (e.g. longitude and latitude).
+        Shape and dtype are included in the hash.
+    **params
+        Additional parameters that affect the cached result.
+        Included through their ``repr``.
+
+    Returns
+    -------
+    str
+        Hex digest.
+    """
+    import hashlib
+
+    from numpy import ascontiguousarray, asarray
+
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        a = ascontiguousarray(asarray(a))
+        h.update(str((a.dtype.str, a.shape)).encode())
+        h.update(a.tobytes())
+    h.update(repr(sorted(params.items())).encode())
+    return h.hexdigest()
+
+
+EARTH_RADIUS = 6370997.0
+"""Earth radius (m) used for spatial indexing, same as pyresample."""
+
+
+def lonlat_to_xyz(longitude, latitude):
+    """Convert longitude/latitude (degrees) to geocentric Cartesian coordinates.
+
+    Parameters
+    ----------
+    longitude, latitude : array-like
+        Must have the same shape.
+
+    Returns
+    -------
+    numpy.ndarray
+        Shape ``(n, 3)``, in meters (see :data:`EARTH_RADIUS`),
+        where ``n`` is the size of `longitude`.
+    """
+    import numpy as np
+
+    lon = np.deg2rad(np.asarray(longitude, dtype=np.float64)).ravel()
+    lat = np.deg2rad(np.asarray(latitude, dtype=np.float64)).ravel()
+    r_cos_lat = EARTH_RADIUS * np.cos(lat)
+    return np.stack(
+        [r_cos_lat * np.cos(lon), r_cos_lat * np.sin(lon), EARTH_RADIUS * np.sin(lat)], axis=-1
+    )
+
+
+def chord_to_arc(d):
+    """Convert straight-line (chord) distance to great-circle distance (m)."""
+    import numpy as np
+
+    return 2 * EARTH_RADIUS * np.arcsin(np.clip(d / (2 * EARTH_RADIUS), 0, 1))
+
+
+def arc_to_chord(d):
+    """Convert great-circle distance to straight-line (chord) distance (m)."""
+    import numpy as np
+
+    return 2 * EARTH_RADIUS * np.sin(np.minimum(d, np.pi * EARTH_RADIUS) / (2 * EARTH_RADIUS))
+
+
+class LonLatIndex:
+    """KD-tree spatial index of longitude/latitude points.
+
+    Points are indexed in 3-D geocentric Cartesian coordinates,
+    so nearest-neighbour queries are correct near the poles and the dateline.
+    Build once per grid and query many times.
+    Instances can be pickled.
+
+    Parameters
+    ----------
+    longitude, latitude : array-like
+        Coordinates of the points to index (any shape, e.g. a 2-D grid).
+        Points with non-finite or out-of-range coordinates are excluded.
+    """
+
+    def __init__(self, longitude, latitude):
+        import numpy as np
+        from scipy.spatial import cKDTree
+
+        lon = np.asarray(longitude, dtype=np.float64)
+        lat = np.asarray(latitude, dtype=np.float64)
+        if lon.shape != lat.shape:
+            raise ValueError("longitude and latitude must have the same shape")
+        self.shape = lon.shape
+        valid = (
+            np.isfinite(lon) & np.isfinite(lat) & (np.abs(lat) <= 90) & (np.abs(lon) <= 360)
+        ).ravel()
+        self._valid_index = np.flatnonzero(valid)
+        # (unbalanced build is much faster for large point sets, with similar query speed)
+        self._tree = cKDTree(
+            lonlat_to_xyz(lon.ravel()[valid], lat.ravel()[valid]),
+            balanced_tree=False,
+            compact_nodes=False,
+        )
+
+    @property
+    def size(self):
+        """Number of indexed (valid) points."""
+        return self._tree.n
+
+    def query(self, longitude, latitude, k=1, radius_of_influence=None):
+        """Find the nearest indexed point(s) to each query point.
+
+        Parameters
+        ----------
+        longitude, latitude : array-like
+            Query points (any shape).
+        k : int
+            Number of neighbours.
+        radius_of_influence : float, optional
+            Maximum great-circle distance (m) of a neighbour.
+
+        Returns
+        -------
+        distance : numpy.ndarray
+            Great-circle distance (m), NaN where no neighbour was found.
+        index : numpy.ndarray
+            Flat index into the indexed points
+            (use ``numpy.unravel_index(index, self.shape)`` for grids),
+            -1 where no neighbour was found.
+            Both have the shape of the query points,
+            with a trailing dimension of size `k` if ``k > 1``.
+        """
+        import numpy as np
+
+        lon = np.asarray(longitude, dtype=np.float64)
+        lat = np.asarray(latitude, dtype=np.float64)
+        shape = lon.shape + ((k,) if k > 1 else ())
+        bound = np.inf if radius_of_influence is None else arc_to_chord(radius_of_influence)
+        ok = (np.isfinite(lon) & np.isfinite(lat)).ravel()
+        distance = np.full((ok.size, k), np.nan)
+        index = np.full((ok.size, k), -1, dtype=np.int64)
+        if self.size > 0 and ok.any():
+            d, i = self._tree.query(
+                lonlat_to_xyz(lon.ravel()[ok], lat.ravel()[ok]),
+                k=k,
+                distance_upper_bound=bound,
+                workers=-1,
+            )
+            d = d.reshape(-1, k)
+            i = i.reshape(-1, k)
+            found = i < self.size
+            i = np.where(found, self._valid_index[np.minimum(i, self.size - 1)], -1)
+            distance[ok] = np.where(found, chord_to_arc(np.where(found, d, 0)), np.nan)
+            index[ok] = i
+        return distance.reshape(shape), index.reshape(shape)
+
+
 def latlon_xarray_to_CoordinateDefinition(longitude=None, latitude=None):
     """Create pyresample SwathDefinition from xarray object.
 
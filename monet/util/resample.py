@@ -1,3 +1,9 @@
+import os
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+from .interp_util import _hash_arrays
+
 try:
     from pyresample.geometry import AreaDefinition, SwathDefinition
     from pyresample.kd_tree import XArrayResamplerNN  # noqa: F401
@@ -13,6 +19,357 @@ try:
 except ImportError:
     has_xesmf = False
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class NeighbourInfoCache:
+    """LRU cache of pyresample nearest-neighbour info,
+    optionally persisted to disk.
+
+    Entries are keyed on a content hash of the source and target
+    latitude/longitude arrays and the resampler settings
+    (e.g. ``radius_of_influence``),
+    so that repeated remaps between the same pair of grids
+    skip the KD-tree query entirely.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries kept in memory.
+        The least recently used entry is evicted first.
+    cache_dir : str or path-like, optional
+        If provided, entries are also written to (and read back from)
+        ``.npz`` files in this directory,
+        allowing reuse across sessions.
+    """
+
+    def __init__(self, maxsize=8, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"monet_neighbour_info_{key}.npz")
+
+    def _insert(self, key, info):
+        self._data[key] = info
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _load(self, key):
+        import numpy as np
+
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        with np.load(path) as f:
+            info = {k: f[k] for k in f.files}
+        info["radius_of_influence"] = float(info["radius_of_influence"])
+        return info
+
+    def _save(self, key, info):
+        import numpy as np
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        # Write to a temporary file first so that concurrent readers
+        # never see a partially written file
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, **info)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        """Return the cached neighbour info for `key`, or ``None``.
+
+        Updates the hit/miss counters.
+        """
+        info = self._data.get(key)
+        if info is None:
+            info = self._load(key)
+            if info is not None:
+                self._insert(key, info)
+        else:
+            self._data.move_to_end(key)
+        if info is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return info
+
+    def put(self, key, info):
+        """Store neighbour info `info` (dict of arrays) under `key`."""
+        self._insert(key, info)
+        if self.cache_dir is not None:
+            self._save(key, info)
+
+    def clear(self):
+        """Empty the in-memory cache and reset the counters.
+        Files in `cache_dir` are left in place.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self):
+        """Report cache statistics, like :func:`functools.lru_cache`.
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple (hits, misses, maxsize, currsize).
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+neighbour_info_cache = NeighbourInfoCache()
+"""Default :class:`NeighbourInfoCache` used by the ``remap_nearest`` accessor methods."""
+
+
+def _resolve_neighbour_info_cache(cache):
+    """``True`` -> default cache, ``False``/``None`` -> no cache,
+    else assumed to be a :class:`NeighbourInfoCache`.
+    """
+    if cache is True:
+        return neighbour_info_cache
+    elif cache is False:
+        return None
+    else:
+        return cache
+
+
+def nearest_neighbour_resampler(source, target, cache=None, **kwargs):
+    """Create a pyresample ``XArrayResamplerNN`` from `source` to `target`
+    with its neighbour info already computed,
+    or restored from `cache` if these grids have been seen before.
+
+    Parameters
+    ----------
+    source, target : xarray.DataArray or xarray.Dataset
+        Objects with 2-D ``latitude`` and ``longitude`` coordinates.
+    cache : NeighbourInfoCache or bool, optional
+        Cache to consult and fill.
+        ``True`` uses the module default :data:`neighbour_info_cache`.
+    kwargs : dict
+        Passed on to ``pyresample.kd_tree.XArrayResamplerNN``,
+        e.g. ``radius_of_influence``.
+
+    Returns
+    -------
+    pyresample.kd_tree.XArrayResamplerNN
+    """
+    import dask
+    import dask.array as da
+    from pyresample import geometry, kd_tree
+
+    cache = _resolve_neighbour_info_cache(cache)
+    source_def = geometry.CoordinateDefinition(lats=source.latitude, lons=source.longitude)
+    target_def = geometry.CoordinateDefinition(lats=target.latitude, lons=target.longitude)
+    if cache is None:
+        r = kd_tree.XArrayResamplerNN(source_def, target_def, **kwargs)
+        r.get_neighbour_info()
+        return r
+
+    key = _hash_arrays(
+        source.longitude.values,
+        source.latitude.values,
+        target.longitude.values,
+        target.latitude.values,
+        **kwargs,
+    )
+    info = cache.get(key)
+    if info is None:
+        r = kd_tree.XArrayResamplerNN(source_def, target_def, **kwargs)
+        r.get_neighbour_info()
+        vii, voi, ia = dask.compute(r.valid_input_index, r.valid_output_index, r.index_array)
+        info = {
+            "valid_input_index": vii,
+            "valid_output_index": voi,
+            "index_array": ia,
+            "radius_of_influence": float(r.radius_of_influence),
+        }
+        cache.put(key, info)
+    else:
+        kwargs["radius_of_influence"] = info["radius_of_influence"]
+        r = kd_tree.XArrayResamplerNN(source_def, target_def, **kwargs)
+
+    chunks = kd_tree.CHUNK_SIZE
+    r.valid_input_index = da.from_array(info["valid_input_index"], chunks=chunks)
+    r.valid_output_index = da.from_array(info["valid_output_index"], chunks=chunks)
+    r.index_array = da.from_array(info["index_array"], chunks=chunks)
+    r.distance_array = None
+    return r
+
+
+def _source_index_from_resampler(resampler):
+    """Flat source grid index of the nearest neighbour of each target point,
+    from a pyresample ``XArrayResamplerNN`` with neighbour info.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array with the target grid shape, -1 where no neighbour.
+    """
+    import dask
+    import numpy as np
+
+    vii, ia = dask.compute(resampler.valid_input_index, resampler.index_array[:, :, 0])
+    ia = np.asarray(ia)
+    valid = np.flatnonzero(np.asarray(vii).ravel())
+    return np.where(ia >= 0, valid[np.where(ia >= 0, ia, 0)], -1)
+
+
+def _take_flat(block, index, fill_value, nd=2):
+    """Take along the flattened trailing `nd` (source grid) axes of `block`,
+    filling where `index` is -1.
+    Applied to the blocks of a dask array by :func:`_take_nearest_dataset`.
+    """
+    import numpy as np
+
+    flat = block.reshape(block.shape[:-nd] + (-1,))
+    out = np.take(flat, np.where(index >= 0, index, 0), axis=-1)
+    out[..., index < 0] = fill_value
+    return out
+
+
+def _idw_weights(distance, power=2):
+    """Inverse-distance weights ``1 / distance**power`` (not normalized).
+
+    Where a point coincides with one of its neighbours (zero distance),
+    that neighbour gets all of the weight.
+    Missing neighbours (NaN distance) get zero weight.
+
+    Parameters
+    ----------
+    distance : numpy.ndarray
+        Neighbour distances, with the neighbours along the last axis.
+    power : float
+        Power of the distance.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    import numpy as np
+
+    d = np.asarray(distance, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = 1 / d**power
+    exact = d == 0
+    w = np.where(exact.any(axis=-1, keepdims=True), exact, w)
+    return np.where(np.isnan(d), 0, w)
+
+
+def _take_idw(block, index, weights, fill_value, nd=2):
+    """Inverse-distance weighted gather along the flattened trailing `nd`
+    (source grid) axes of `block`.
+
+    `index` and `weights` have the neighbours along their last axis.
+    NaN source values are left out, with the weights of the remaining
+    neighbours renormalized; `fill_value` where no neighbour has data.
+    """
+    import numpy as np
+
+    flat = block.reshape(block.shape[:-nd] + (-1,))
+    values = np.take(flat, np.where(index >= 0, index, 0), axis=-1)
+    w = np.where(np.isnan(values), 0, weights)
+    total = w.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = (np.where(w > 0, values, 0) * w).sum(axis=-1) / total
+    out[total == 0] = fill_value
+    return out.astype(block.dtype, copy=False)
+
+
+def _take_nearest_dataset(dset, index, src_dims=("y", "x"), dst_dims=("y", "x"), weights=None):
+    """Nearest-neighbour gather of all floating-point variables of `dset`
+    on the source grid, using flat source `index` (target grid shape).
+
+    Variables with the same dtype and dims are stacked and gathered
+    in a single operation; the result is lazy (dask).
+
+    Parameters
+    ----------
+    dset : xarray.Dataset
+    index : numpy.ndarray
+        Flat source grid index of each target point, -1 for none
+        (e.g. from :func:`_source_index_from_resampler`).
+    src_dims : tuple of str
+        Source grid dimensions.
+        Variables are handled only if these are their trailing dims.
+    dst_dims : tuple of str
+        Target grid dimensions of the output.
+    weights : numpy.ndarray, optional
+        For a k-nearest weighted gather, the neighbour weights
+        (e.g. from :func:`_idw_weights`).
+        `index` and `weights` then have a trailing neighbour dimension.
+
+    Returns
+    -------
+    results : dict
+        Variable name -> gathered :class:`xarray.DataArray`.
+    skipped : list of str
+        Names of the data variables not handled
+        (non-float dtype or source grid dims not trailing).
+    """
+    import dask.array as da
+    import numpy as np
+    import xarray as xr
+
+    src_dims = tuple(src_dims)
+    nd = len(src_dims)
+    groups = {}
+    skipped = []
+    for name, v in dset.data_vars.items():
+        if v.dims[-nd:] == src_dims and np.issubdtype(v.dtype, np.floating):
+            groups.setdefault((v.dtype, v.dims, v.shape), []).append(name)
+        else:
+            skipped.append(name)
+
+    if weights is None:
+        func, args, target_shape = _take_flat, (index,), index.shape
+    else:
+        func, args, target_shape = _take_idw, (index, weights), index.shape[:-1]
+    results = {}
+    for (dtype, dims, shape), names in groups.items():
+        stacked = da.stack(
+            [
+                v if isinstance(v, da.Array) else da.from_array(v, chunks=-1, name=False)
+                for v in (dset[name].data for name in names)
+            ]
+        )
+        # Whole source grid in each block; chunks over the other dims are kept
+        stacked = stacked.rechunk({stacked.ndim - i - 1: -1 for i in range(nd)})
+        out = stacked.map_blocks(
+            func,
+            *args,
+            np.array(np.nan, dtype=dtype),
+            nd,
+            chunks=stacked.chunks[:-nd] + tuple((n,) for n in target_shape),
+            dtype=dtype,
+        )
+        for i, name in enumerate(names):
+            v = dset[name]
+            coords = {c: cv for c, cv in v.coords.items() if not set(cv.dims) & set(src_dims)}
+            results[name] = xr.DataArray(
+                out[i],
+                dims=dims[:-nd] + tuple(dst_dims),
+                coords=coords,
+                attrs=v.attrs.copy(),
+                name=name,
+            )
+
+    return results, skipped
+
 
 def _ensure_swathdef_compatability(defn):
     """Ensures the SwathDefinition is compatible with XArrayResamplerNN.
@@ -103,23 +460,699 @@ def resample_stratify(da, levels, vertical, axis=1):
     return out
 
 
-def resample_xesmf(source_da, target_da, cleanup=False, **kwargs):
+class XESMFWeightCache:
+    """Directory of xESMF weight files, keyed on a content hash of the
+    source and target grids and the regridding settings (e.g. ``method``).
+
+    Building ESMF weights for large grids is slow;
+    with the cache, each pair of grids is handled only once,
+    and later calls (in this or any other process) read the weights back
+    (xESMF ``reuse_weights``).
+    Weight files are written atomically under a per-entry file lock,
+    so parallel jobs sharing `cache_dir` don't overwrite each other
+    or build the same weights twice.
+    When the directory grows past `max_bytes`,
+    the least recently used weight files are deleted.
+    The most recently used regridders are also kept in memory.
+
+    Parameters
+    ----------
+    cache_dir : str or path-like, optional
+        Directory for the weight files.
+        Default: ``$MONET_XESMF_CACHE_DIR``, else ``~/.cache/monet/xesmf``.
+    max_bytes : int or str
+        Maximum total size of the weight files,
+        e.g. ``2 * 1024**3`` or ``'2GiB'``.
+    maxsize : int
+        Maximum number of regridders kept in memory.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes="2GiB", maxsize=4):
+        from dask.utils import parse_bytes
+
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                "MONET_XESMF_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "monet", "xesmf"),
+            )
+        self.cache_dir = cache_dir
+        self.max_bytes = parse_bytes(max_bytes) if isinstance(max_bytes, str) else max_bytes
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._regridders = OrderedDict()
+
+    @staticmethod
+    def key(source, target, method, **kwargs):
+        """Cache key for regridding `source` to `target` with `method`.
+
+        Parameters
+        ----------
+        source, target : xarray.DataArray or xarray.Dataset
+            Objects with ``lat``/``lon`` (and optionally ``lat_b``/``lon_b``)
+            in xESMF convention.
+        method : str
+            xESMF method.
+        kwargs : dict
+            Other ``xesmf.Regridder`` settings affecting the weights.
+
+        Returns
+        -------
+        str
+        """
+        arrays = [
+            obj[name].values
+            for obj in [source, target]
+            for name in ["lat", "lon", "lat_b", "lon_b"]
+            if name in obj.coords or name in obj
+        ]
+        return _hash_arrays(*arrays, method=method, **kwargs)
+
+    def path(self, key):
+        """Weight file path for `key`."""
+        return os.path.join(self.cache_dir, f"monet_xesmf_weights_{key}.nc")
+
+    def _files(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [
+            os.path.join(self.cache_dir, fn)
+            for fn in os.listdir(self.cache_dir)
+            if fn.startswith("monet_xesmf_weights_") and fn.endswith(".nc")
+        ]
+
+    def _lock_path(self, key):
+        return os.path.join(self.cache_dir, f".{key}.lock")
+
+    @contextmanager
+    def _lock(self, key, blocking=True):
+        """Exclusive lock on the entry for `key` (no-op without ``fcntl``).
+
+        Yields whether the lock was acquired
+        (always, unless not `blocking` and the entry is locked elsewhere).
+        """
+        try:
+            import fcntl
+        except ImportError:  # e.g. Windows
+            yield True
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        lock_path = self._lock_path(key)
+        while True:
+            f = open(lock_path, "a")
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                f.close()
+                yield False
+                return
+            try:
+                same = os.fstat(f.fileno()).st_ino == os.stat(lock_path).st_ino
+            except FileNotFoundError:
+                same = False
+            if same:
+                break
+            # The lock file was removed (entry evicted) while we waited: retry
+            f.close()
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
+
+    def _remove(self, fn, blocking=True):
+        """Delete weight file `fn` and its lock file, under the entry lock.
+
+        Returns whether the entry was removed
+        (not if not `blocking` and the entry is in use elsewhere).
+        """
+        key = os.path.basename(fn)[len("monet_xesmf_weights_") : -len(".nc")]
+        with self._lock(key, blocking=blocking) as acquired:
+            if not acquired:
+                return False
+            for path in [fn, self._lock_path(key)]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:  # removed by another process
+                    pass
+        return True
+
+    def regridder(self, source, target, method="bilinear", **kwargs):
+        """Get an ``xesmf.Regridder``, from the cache if possible.
+
+        Parameters
+        ----------
+        source, target : xarray.DataArray or xarray.Dataset
+            Source and target grids in xESMF convention.
+        method : str
+            xESMF method.
+        kwargs : dict
+            Passed on to ``xesmf.Regridder``.
+            ``filename`` and ``reuse_weights`` are managed by the cache.
+
+        Returns
+        -------
+        xesmf.Regridder
+        """
+        import xesmf as xe
+
+        kwargs.pop("filename", None)
+        kwargs.pop("reuse_weights", None)
+        key = self.key(source, target, method, **kwargs)
+        regridder = self._regridders.get(key)
+        if regridder is not None:
+            self._regridders.move_to_end(key)
+            self.hits += 1
+            return regridder
+
+        path = self.path(key)
+        with self._lock(key):
+            if os.path.isfile(path):
+                self.hits += 1
+                os.utime(path)  # mark as recently used
+                regridder = xe.Regridder(
+                    source, target, method, filename=path, reuse_weights=True, **kwargs
+                )
+            else:
+                self.misses += 1
+                # Write to a temporary file first so that readers
+                # never see a partially written file
+                tmp = f"{path}.{os.getpid()}.tmp"
+                regridder = xe.Regridder(source, target, method, filename=tmp, **kwargs)
+                if not os.path.isfile(tmp):  # newer xESMF doesn't write automatically
+                    regridder.to_netcdf(tmp)
+                os.replace(tmp, path)
+        self.evict()
+
+        self._regridders[key] = regridder
+        while len(self._regridders) > self.maxsize:
+            self._regridders.popitem(last=False)
+        return regridder
+
+    def evict(self):
+        """Delete the least recently used weight files
+        until their total size is within `max_bytes`.
+        The most recently used file is always kept,
+        and entries in use (locked) by other processes are skipped.
+        """
+        files = []
+        for fn in self._files():
+            try:
+                st = os.stat(fn)
+            except FileNotFoundError:  # removed by another process
+                continue
+            files.append((st.st_mtime, st.st_size, fn))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, fn in files[:-1]:
+            if total <= self.max_bytes:
+                break
+            if self._remove(fn, blocking=False):
+                total -= size
+
+    def clear(self):
+        """Delete all weight files and empty the in-memory cache."""
+        for fn in self._files():
+            self._remove(fn)
+        self._regridders.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self):
+        """Report cache statistics, like :func:`functools.lru_cache`.
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple (hits, misses, maxsize, currsize),
+            where `currsize` is the number of weight files on disk.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._files()))
+
+
+xesmf_weight_cache = XESMFWeightCache()
+"""Default :class:`XESMFWeightCache` used by :func:`resample_xesmf`."""
+
+
+def _regrid_dataset(regridder, dset):
+    """Apply an xESMF `regridder` to all variables of `dset` on its grid.
+
+    Variables with the same dtype and dims are stacked
+    and regridded in a single sparse-matrix application,
+    chunked over the non-horizontal dims
+    (eager input is wrapped in dask arrays, not copied, and computed per group).
+    Variables without the horizontal dims are passed through;
+    those with only some of them are dropped.
+    `dset` is not modified.
+
+    Returns
+    -------
+    xarray.Dataset
+        New Dataset on the target grid,
+        lazy if any of the regridded variables of `dset` were.
+    """
+    import dask.array as da
+    import numpy as np
+    import xarray as xr
+
+    horiz = getattr(regridder, "in_horiz_dims", None)  # xESMF >= 0.6
+    if horiz is None:
+        lat, lon = dset["lat"], dset["lon"]
+        horiz = lat.dims if lat.ndim == 2 else (lat.dims[0], lon.dims[0])
+    horiz = tuple(horiz)
+    nh = len(horiz)
+    groups = {}
+    passed = []
+    lazy = False
+    for name, v in dset.data_vars.items():
+        if name in ["lat", "lon", "lat_b", "lon_b"]:
+            continue
+        if set(horiz) <= set(v.dims):
+            v = v.transpose(..., *horiz)
+            groups.setdefault((v.dtype, v.dims, v.shape), []).append(name)
+            lazy |= isinstance(v.data, da.Array)
+        elif not set(horiz) & set(v.dims):
+            passed.append(name)
+
+    results = {}
+    for (dtype, dims, shape), names in groups.items():
+        arrays = [dset[name].transpose(..., *horiz).data for name in names]
+        # Whole horizontal grid in each block, chunked over the other dims;
+        # eager arrays are wrapped (not copied) so that blocks are regridded
+        # one at a time without stacking full copies of the variables
+        chunks = tuple("auto" if i < len(dims) - nh else -1 for i in range(len(dims)))
+        stacked = da.stack(
+            [
+                v if isinstance(v, da.Array) else da.from_array(v, chunks=chunks, name=False)
+                for v in arrays
+            ]
+        )
+        stacked = stacked.rechunk(
+            {i: "auto" if i < stacked.ndim - nh else -1 for i in range(stacked.ndim)}
+        )
+        v0 = dset[names[0]]
+        coords = {c: cv for c, cv in v0.coords.items() if not set(cv.dims) & set(horiz)}
+        out = regridder(xr.DataArray(stacked, dims=("__variable",) + dims, coords=coords))
+        if np.issubdtype(dtype, np.floating):
+            out = out.astype(dtype, copy=False)
+        if not lazy:
+            out = out.compute()
+        for i, name in enumerate(names):
+            v = out.isel(__variable=i)
+            v.attrs = dset[name].attrs.copy()
+            results[name] = v.rename(name)
+
+    return xr.Dataset(
+        {
+            name: results[name] if name in results else v
+            for name, v in dset.data_vars.items()
+            if name in results or name in passed
+        },
+        attrs=dset.attrs.copy(),
+    )
+
+
+def resample_xesmf(source_da, target_da, cleanup=False, cache=True, **kwargs):
+    """Regrid with xESMF.
+
+    Parameters
+    ----------
+    source_da, target_da : xarray.DataArray or xarray.Dataset
+        Source data and target grid, in xESMF convention (``lat``/``lon``).
+    cleanup : bool
+        Delete the weight file afterwards.
+        Only used without `cache`.
+    cache : XESMFWeightCache or bool
+        Weight cache to use.
+        ``True`` uses the module default :data:`xesmf_weight_cache`.
+        Not used if ``filename`` is passed.
+    kwargs : dict
+        Passed on to ``xesmf.Regridder``.
+
+    Returns
+    -------
+    xarray.DataArray or xarray.Dataset
+    """
     if has_xesmf:
         import xarray as xr
         import xesmf as xe
 
-        regridder = xe.Regridder(source_da, target_da, **kwargs)
-        if cleanup:
-            regridder.clean_weight_file()
+        if cache is True:
+            cache = xesmf_weight_cache
+        if cache and "filename" not in kwargs:
+            regridder = cache.regridder(source_da, target_da, **kwargs)
+        else:
+            regridder = xe.Regridder(source_da, target_da, **kwargs)
+            if cleanup:
+                regridder.clean_weight_file()
         if isinstance(source_da, xr.Dataset):
-            das = {}
-            for name, i in source_da.data_vars.items():
-                das[name] = regridder(i)
-            ds = xr.Dataset(das)
-            ds.attrs = source_da.attrs
-            return ds
+            return _regrid_dataset(regridder, source_da)
         else:
             da = regridder(source_da)
             if da.name is None:
                 da.name = source_da.name
             return da
+
+
+class Remapper:
+    """Precomputed remapping from a source grid to a target grid,
+    reusable for any DataArray or Dataset on the source grid.
+
+    Create with :func:`build_remapper`.
+    Remapper objects hold only arrays (indices or weights) and coordinates,
+    so they can be pickled, sent to dask workers or process pools,
+    and saved to disk (:meth:`save`, :func:`load_remapper`).
+
+    Attributes
+    ----------
+    method : str
+        Remapping method.
+    source_shape : tuple of int
+        Source grid shape.
+    target_latitude, target_longitude : numpy.ndarray
+        Target grid coordinates.
+    target_dims : tuple of str
+        Target grid dimension names.
+    index : numpy.ndarray
+        For nearest-neighbour methods,
+        flat source grid index of each target point, -1 where none.
+        For ``'idw'``, with a trailing neighbour dimension.
+    weights : numpy.ndarray
+        For ``'idw'``, the inverse-distance weight of each neighbour in `index`.
+    """
+
+    def __init__(
+        self,
+        method,
+        source_shape,
+        target_latitude,
+        target_longitude,
+        target_dims=("y", "x"),
+        index=None,
+        weights=None,
+        xesmf_grids=None,
+        xesmf_weights=None,
+        xesmf_kwargs=None,
+    ):
+        self.method = method
+        self.source_shape = tuple(source_shape)
+        self.target_latitude = target_latitude
+        self.target_longitude = target_longitude
+        self.target_dims = tuple(target_dims)
+        self.index = index
+        self.weights = weights
+        self.xesmf_grids = xesmf_grids
+        self.xesmf_weights = xesmf_weights
+        self.xesmf_kwargs = xesmf_kwargs
+        self._regridder = None
+
+    def __repr__(self):
+        return (
+            f"<{type(self).__name__} method={self.method!r} "
+            f"source_shape={self.source_shape} target_shape={self.target_latitude.shape}>"
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_regridder"] = None  # rebuilt from the weights on first use
+        return state
+
+    def __call__(self, data):
+        """Remap `data` to the target grid.
+
+        Parameters
+        ----------
+        data : xarray.DataArray or xarray.Dataset
+            Data on the source grid.
+            Lazy (dask) input gives lazy output.
+
+        Returns
+        -------
+        xarray.DataArray or xarray.Dataset
+            Data on the target grid.
+        """
+        import xarray as xr
+
+        if self.xesmf_weights is not None:
+            return self._apply_xesmf(data)
+
+        from ..monet_accessor import _dataset_to_monet
+
+        data = _dataset_to_monet(data)
+        if data.latitude.shape != self.source_shape:
+            raise ValueError(
+                f"data grid shape {data.latitude.shape} does not match "
+                f"remapper source grid shape {self.source_shape}"
+            )
+        if isinstance(data, xr.DataArray):
+            name = data.name if data.name is not None else "__data"
+            out = self._apply_nearest(data.to_dataset(name=name), data.latitude.dims)[name]
+            out.name = data.name
+            return out
+        else:
+            return self._apply_nearest(data, data.latitude.dims)
+
+    def _apply_nearest(self, dset, src_dims):
+        import numpy as np
+        import xarray as xr
+
+        src_dims = tuple(src_dims)
+        dset = dset.drop_vars(["latitude", "longitude"])
+        gridded = []
+        for name, v in dset.data_vars.items():
+            if set(src_dims) <= set(v.dims):
+                v = v.transpose(..., *src_dims)
+                if not np.issubdtype(v.dtype, np.floating):
+                    v = v.astype(np.float64)
+                dset[name] = v
+                gridded.append(name)
+        # Can't remap variables with only some of the grid dims
+        dset = dset.drop_vars(
+            [
+                name
+                for name, v in dset.data_vars.items()
+                if name not in gridded and set(src_dims) & set(v.dims)
+            ]
+        )
+        results, _ = _take_nearest_dataset(
+            dset[gridded],
+            self.index,
+            src_dims=src_dims,
+            dst_dims=self.target_dims,
+            weights=self.weights,
+        )
+        out = xr.Dataset(
+            {name: results.get(name, v) for name, v in dset.data_vars.items()},
+            attrs=dset.attrs.copy(),
+        )
+        out.coords["latitude"] = (self.target_dims, self.target_latitude)
+        out.coords["longitude"] = (self.target_dims, self.target_longitude)
+        return out
+
+    def _get_regridder(self):
+        import xesmf as xe
+
+        if self._regridder is None:
+            grid_in, grid_out = self.xesmf_grids
+            self._regridder = xe.Regridder(
+                grid_in, grid_out, self.method, weights=self.xesmf_weights, **self.xesmf_kwargs
+            )
+        return self._regridder
+
+    def _apply_xesmf(self, data):
+        import xarray as xr
+
+        from ..monet_accessor import _rename_latlon, _rename_to_monet_latlon
+
+        regridder = self._get_regridder()
+        data = _rename_latlon(data)
+        if isinstance(data, xr.Dataset):
+            out = _regrid_dataset(regridder, data)
+        else:
+            out = regridder(data)
+            if out.name is None:
+                out.name = data.name
+        return _rename_to_monet_latlon(out)
+
+    def save(self, path):
+        """Save to `path` (pickle), for :func:`load_remapper`."""
+        import pickle
+
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_remapper(path):
+    """Load a :class:`Remapper` saved with :meth:`Remapper.save`."""
+    import pickle
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def build_remapper(
+    source,
+    target,
+    method="nearest",
+    radius_of_influence=None,
+    neighbours=4,
+    power=2,
+    cache=True,
+    **kwargs,
+):
+    """Precompute the remapping from the grid of `source` to the grid of `target`.
+
+    Parameters
+    ----------
+    source, target : xarray.DataArray or xarray.Dataset
+        Objects defining the source and target grids
+        through their latitude/longitude coordinates.
+    method : str
+        ``'nearest'`` for nearest neighbour
+        (KD-tree on the sphere, see :class:`~monet.util.interp_util.LonLatIndex`),
+        or an xESMF method, e.g. ``'bilinear'``, ``'conservative'``,
+        ``'patch'``, ``'nearest_s2d'``, ``'nearest_d2s'``.
+        ``'idw'`` gives the inverse-distance weighted mean
+        of the `neighbours` nearest source points.
+    radius_of_influence : float, optional
+        For ``'nearest'`` and ``'idw'``,
+        maximum great-circle distance (m) of a neighbour.
+        Target points with no source point in range get NaN.
+    neighbours : int
+        For ``'idw'``, number of neighbours.
+    power : float
+        For ``'idw'``, power of the inverse distance used as weight.
+    cache : XESMFWeightCache or bool
+        For xESMF methods, weight cache to use.
+        ``True`` uses the module default :data:`xesmf_weight_cache`.
+    kwargs : dict
+        Passed on to ``xesmf.Regridder`` for xESMF methods.
+
+    Returns
+    -------
+    Remapper
+    """
+    from ..monet_accessor import _dataset_to_monet, _rename_latlon
+    from .interp_util import LonLatIndex
+
+    if method in ["nearest", "idw"]:
+        s = _dataset_to_monet(source)
+        t = _dataset_to_monet(target)
+        k = neighbours if method == "idw" else 1
+        distance, index = LonLatIndex(s.longitude.values, s.latitude.values).query(
+            t.longitude.values, t.latitude.values, k=k, radius_of_influence=radius_of_influence
+        )
+        if method == "idw" and k == 1:
+            distance, index = distance[..., None], index[..., None]
+        return Remapper(
+            method,
+            s.latitude.shape,
+            t.latitude.values,
+            t.longitude.values,
+            target_dims=t.latitude.dims,
+            index=index,
+            weights=_idw_weights(distance, power) if method == "idw" else None,
+        )
+
+    if not has_xesmf:
+        raise ImportError(f"xesmf is required for method {method!r}")
+    import xesmf as xe
+
+    def grid(obj):
+        obj = _rename_latlon(obj)
+        names = [n for n in ["lat", "lon", "lat_b", "lon_b"] if n in obj.coords or n in obj]
+        return obj.reset_coords()[names].set_coords(names)
+
+    grid_in, grid_out = grid(source), grid(target)
+    if cache is True:
+        cache = xesmf_weight_cache
+    if cache:
+        regridder = cache.regridder(grid_in, grid_out, method, **kwargs)
+    else:
+        regridder = xe.Regridder(grid_in, grid_out, method, **kwargs)
+    t = _rename_latlon(target)
+    remapper = Remapper(
+        method,
+        grid_in.lat.shape,
+        t.lat.values,
+        t.lon.values,
+        target_dims=t.lat.dims,
+        xesmf_grids=(grid_in, grid_out),
+        xesmf_weights=regridder.weights,
+        xesmf_kwargs=kwargs,
+    )
+    remapper._regridder = regridder
+    return remapper
+
+
+def remap_streaming(
+    remapper, data, path=None, max_memory="1GiB", block_dims=("time", "z"), **kwargs
+):
+    """Remap `data` with `remapper` in blocks over `block_dims`,
+    keeping memory use bounded, optionally writing the result to `path`.
+
+    `data` is chunked (dask) so that each block, in and out,
+    fits within `max_memory` shared among the dask workers,
+    splitting along the last of `block_dims` (e.g. ``'z'``) only if
+    a single step of the first (e.g. ``'time'``) does not fit.
+    This allows remapping fields larger than memory,
+    e.g. from lazily opened files.
+
+    Parameters
+    ----------
+    remapper : Remapper
+        From :func:`build_remapper`.
+    data : xarray.DataArray or xarray.Dataset
+        Data on the source grid.
+        Already loaded or lazily loaded (e.g. ``xarray.open_dataset``).
+    path : str or path-like, optional
+        If provided, the result is computed block by block and written to
+        this zarr store (``.zarr`` extension) or netCDF file (otherwise).
+    max_memory : int or str
+        Memory cap, e.g. ``'4GiB'``.
+    block_dims : tuple of str
+        Dimensions to split `data` along.
+        Those not present are ignored.
+    kwargs : dict
+        Passed on to ``to_zarr``/``to_netcdf``.
+
+    Returns
+    -------
+    xarray.DataArray or xarray.Dataset
+        Lazy (dask) result on the target grid.
+    """
+    import dask
+    import numpy as np
+    import xarray as xr
+    from dask.utils import parse_bytes
+
+    if isinstance(max_memory, str):
+        max_memory = parse_bytes(max_memory)
+    num_workers = dask.config.get("num_workers", None) or os.cpu_count() or 1
+    budget = max(max_memory // num_workers, 1)
+
+    block_dims = [d for d in block_dims if d in data.dims]
+    variables = data.data_vars.values() if isinstance(data, xr.Dataset) else [data]
+    ratio = np.prod(remapper.target_latitude.shape) / np.prod(remapper.source_shape)
+    step_bytes = 1
+    for v in variables:
+        step = v.dtype.itemsize * np.prod([n for d, n in v.sizes.items() if d not in block_dims])
+        # Input, output and gather temporaries
+        step_bytes = max(step_bytes, int(step * (1 + 2 * ratio)))
+
+    units = max(budget // step_bytes, 1)
+    chunks = {}
+    for d in reversed(block_dims):
+        chunks[d] = int(min(data.sizes[d], units))
+        units = max(units // chunks[d], 1)
+    chunks.update({d: -1 for d in data.dims if d not in chunks})
+
+    with dask.config.set({"array.chunk-size": budget}):
+        out = remapper(data.chunk(chunks))
+    if path is not None:
+        ds = out if isinstance(out, xr.Dataset) else out.to_dataset(name=out.name or "data")
+        if str(path).rstrip("/").endswith(".zarr"):
+            ds.to_zarr(path, **kwargs)
+        else:
+            ds.to_netcdf(path, **kwargs)
+    return out
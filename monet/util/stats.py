@@ -1847,3 +1847,748 @@ def stats(df, minval, maxval):
         dd["POD"] = 1.0
         dd["FAR"] = 0.0
     return dd
+
+
+# Metrics available in `compute`, derived from the sufficient statistics
+# accumulated in `_sufficient_stats` (keys of the `s` dict)
+_FUSED_METRICS = {
+    "NO": lambda s: s["n"],
+    "NP": lambda s: s["n"],
+    "NOP": lambda s: s["n"],
+    "MO": lambda s: s["so"] / s["n"],
+    "MP": lambda s: s["sm"] / s["n"],
+    "STDO": lambda s: np.sqrt(np.maximum(s["soo"] / s["n"] - (s["so"] / s["n"]) ** 2, 0)),
+    "STDP": lambda s: np.sqrt(np.maximum(s["smm"] / s["n"] - (s["sm"] / s["n"]) ** 2, 0)),
+    "MB": lambda s: (s["sm"] - s["so"]) / s["n"],
+    "NMB": lambda s: (s["sm"] - s["so"]) / s["so"] * 100.0,
+    "NMB_ABS": lambda s: (s["sm"] - s["so"]) / np.abs(s["so"]) * 100.0,
+    "ME": lambda s: s["sad"] / s["n"],
+    "NME": lambda s: s["sad"] / s["so"] * 100.0,
+    "NME_m": lambda s: s["sad"] / s["so"] * 100.0,
+    "NME_m_ABS": lambda s: s["sad"] / np.abs(s["so"]) * 100.0,
+    "NMdnGE": lambda s: s["sad"] / s["so"] * 100.0,  # mean-based, despite the name
+    "RMSE": lambda s: np.sqrt(s["ssd"] / s["n"]),
+    "MNB": lambda s: s["snb"] / s["nnb"] * 100.0,
+    "MNE": lambda s: s["sne"] / s["nnb"] * 100.0,
+    "FB": lambda s: s["sfb"] / s["nfb"] * 2.0 * 100.0,
+    "FE": lambda s: s["sfe"] / s["nfe"] * 2.0 * 100.0,
+    "RM": lambda s: s["srm"] / s["nrm"],
+    "USUTPB": lambda s: (s["maxm"] - s["maxo"]) / s["maxo"] * 100.0,
+    "USUTPE": lambda s: np.abs(s["maxm"] - s["maxo"]) / s["maxo"] * 100.0,
+    "R": lambda s: _fused_r(s),
+    "R2": lambda s: _fused_r(s) ** 2,
+    "RMSEs": lambda s: _fused_rmse_regression(s, "s"),
+    "RMSEu": lambda s: _fused_rmse_regression(s, "u"),
+    "IOA": lambda s: 1.0 - s["ssd"] / s["sioa"],
+    "d1": lambda s: 1.0 - s["sad"] / s["sd1"],
+    "E1": lambda s: 1.0 - s["sad"] / s["se1"],
+    "AC": lambda s: _fused_ac(s),
+    "WDMB": lambda s: s["swd"] / s["n"],
+    "WDMB_m": lambda s: s["swd"] / s["n"],
+    "WDNMB_m": lambda s: s["swd"] / s["so"] * 100.0,
+    "WDME": lambda s: s["swdad"] / s["n"],
+    "WDME_m": lambda s: s["swdad"] / s["n"],
+    "WDRMSE": lambda s: np.sqrt(s["swdsd"] / s["n"]),
+    "WDRMSE_m": lambda s: np.sqrt(s["swdsd"] / s["n"]),
+    "WDIOA": lambda s: 1.0 - s["swdsd"] / s["swdioa"],
+    "WDIOA_m": lambda s: 1.0 - s["swdsd"] / s["swdioa"],
+    "WDAC": lambda s: s["swdac"] / np.sqrt(s["swdmm"] * s["swdoo"]),
+}
+
+# Metrics needing a second pass, about the observation mean
+_FUSED_METRICS_2 = {"IOA", "d1", "E1", "WDIOA", "WDIOA_m", "WDAC"}
+
+# Metrics needing each element-wise ratio or the wind direction difference
+_FUSED_RATIOS = {
+    "nb": {"MNB", "MNE"},
+    "fb": {"FB", "FE"},
+    "rm": {"RM"},
+    "wd": {"WDMB", "WDMB_m", "WDNMB_m", "WDME", "WDME_m", "WDRMSE", "WDRMSE_m"}
+    | {"WDIOA", "WDIOA_m", "WDAC"},
+}
+
+# Default metrics: wind direction metrics only make sense for directions,
+# so they (and their circular difference sums) must be asked for
+_FUSED_DEFAULT = [name for name in _FUSED_METRICS if not name.startswith("WD")]
+
+
+def _fused_r(s):
+    """Pearson correlation coefficient from the sufficient statistics."""
+    n = s["n"]
+    cov = s["som"] - s["so"] * s["sm"] / n
+    varo = s["soo"] - s["so"] ** 2 / n
+    varm = s["smm"] - s["sm"] ** 2 / n
+    return cov / np.sqrt(varo * varm)
+
+
+def _fused_ac(s):
+    """Anomaly correlation from the sufficient statistics
+    (polynomial in the observation mean, so no second pass)."""
+    n, so, sm, soo, smm, som = (s[k] for k in ["n", "so", "sm", "soo", "smm", "som"])
+    obar = so / n
+    # sums of (m - obar) * (o - obar), (m - obar) ** 2 and (o - obar) ** 2
+    p1 = som - obar * sm
+    smmc = smm - 2 * obar * sm + n * obar**2
+    sooc = soo - obar * so
+    return p1 / np.sqrt(smmc * sooc)
+
+
+def _fused_rmse_regression(s, kind):
+    """RMSEs (``kind='s'``) or RMSEu (``kind='u'``)
+    about the linear regression of the predictions on the observations."""
+    n, so, sm, soo, smm, som = (s[k] for k in ["n", "so", "sm", "soo", "smm", "som"])
+    slope = (som - so * sm / n) / (soo - so**2 / n)
+    b = (sm - slope * so) / n
+    if kind == "s":
+        # sum of (b + slope * o - o) ** 2
+        k = slope - 1
+        sse = n * b**2 + 2 * b * k * so + k**2 * soo
+    else:
+        # sum of (m - b - slope * o) ** 2
+        sse = (
+            smm - 2 * b * sm - 2 * slope * som + n * b**2 + 2 * b * slope * so + slope**2 * soo
+        )
+    return np.sqrt(np.maximum(sse, 0) / n)
+
+
+def _sufficient_stats(
+    o,
+    m,
+    valid,
+    total,
+    maximum,
+    expand,
+    ratios=("nb", "fb", "rm", "wd"),
+    second_pass=True,
+    obs_mean=None,
+):
+    """Accumulate the sums used by `_FUSED_METRICS` over the `valid` pairs.
+
+    `o` and `m` are float arrays, set to 0 where not `valid`.
+    ``total(a, where)`` and ``maximum(a, where)`` do the reductions
+    (over axes or groups),
+    ``expand(stat)`` broadcasts a reduced statistic back to the data.
+    Only the element-wise `ratios` requested are accumulated,
+    and the `second_pass` sums if requested,
+    about `obs_mean` if provided, otherwise about the mean of `o`.
+    """
+    s = {}
+    s["n"] = total(np.ones(o.shape, dtype=np.int64), valid)
+    s["so"] = total(o, valid)
+    s["sm"] = total(m, valid)
+    s["soo"] = total(o * o, valid)
+    s["smm"] = total(m * m, valid)
+    s["som"] = total(o * m, valid)
+    d = m - o
+    ad = np.abs(d)
+    s["sad"] = total(ad, valid)
+    s["ssd"] = total(d * d, valid)
+    s["maxo"] = maximum(o, valid)
+    s["maxm"] = maximum(m, valid)
+
+    # Ratios, each over its own valid (finite) elements
+    # (as with `np.ma.masked_invalid` in the single metrics)
+    if "wd" in ratios:
+        b = circlebias_m(d)
+        s["swd"] = total(b, valid)
+        s["swdad"] = total(np.abs(b), valid)
+        s["swdsd"] = total(b * b, valid)
+
+    for key, num, den in [("nb", d, o), ("fb", d, m + o), ("rm", o, m)]:
+        if key not in ratios:
+            continue
+        ok = valid & (den != 0)
+        ratio = np.divide(num, den, out=np.zeros_like(num), where=ok)
+        ok &= np.isfinite(ratio)
+        s["n" + key] = total(np.ones(o.shape, dtype=np.int64), ok)
+        s["s" + key] = total(ratio, ok)
+        if key == "nb":
+            # |m - o| / o, as MNE (not |(m - o) / o|, for negative observations)
+            s["sne"] = total(np.divide(ad, o, out=np.zeros_like(ad), where=ok), ok)
+        elif key == "fb":
+            s["sfe"] = total(np.divide(ad, m + o, out=np.zeros_like(ad), where=ok), ok)
+            s["nfe"] = s["nfb"]
+
+    if second_pass:
+        obar = expand(s["so"] / s["n"]) if obs_mean is None else obs_mean
+        mc = m - obar
+        oc = o - obar
+        amc = np.abs(mc)
+        aoc = np.abs(oc)
+        s["sd1"] = total(amc + aoc, valid)
+        s["sioa"] = total((amc + aoc) ** 2, valid)
+        s["se1"] = total(aoc, valid)
+    if second_pass and "wd" in ratios:
+        bhat = circlebias_m(mc)
+        ohat = circlebias_m(oc)
+        s["swdioa"] = total((np.abs(bhat) + np.abs(ohat)) ** 2, valid)
+        s["swdac"] = total(bhat * ohat, valid)
+        s["swdmm"] = total(bhat * bhat, valid)
+        s["swdoo"] = total(ohat * ohat, valid)
+    return s
+
+
+def _check_fused_metrics(metrics):
+    """Default and check the metric names for :func:`compute`."""
+    if metrics is None:
+        return list(_FUSED_DEFAULT)
+    unknown = [name for name in metrics if name not in _FUSED_METRICS]
+    if unknown:
+        raise ValueError(
+            f"metric(s) {unknown} not available in compute, choose from {list(_FUSED_METRICS)}"
+        )
+    return list(metrics)
+
+
+def _matched_pairs(obs, mod):
+    """Float copies of `obs` and `mod`, set to 0 where either is masked or not finite,
+    and the mask of the valid pairs."""
+    o = np.ma.asarray(obs).astype(np.float64).filled(np.nan)
+    m = np.ma.asarray(mod).astype(np.float64).filled(np.nan)
+    valid = np.isfinite(o) & np.isfinite(m)
+    o[~valid] = 0
+    m[~valid] = 0
+    return o, m, valid
+
+
+def _fused_needs(metrics):
+    """The element-wise ratios and whether the second pass
+    are needed by `metrics` (see :func:`_sufficient_stats`)."""
+    ratios = [k for k, names in _FUSED_RATIOS.items() if not names.isdisjoint(metrics)]
+    return ratios, not _FUSED_METRICS_2.isdisjoint(metrics)
+
+
+def _derive_metrics(s, metrics):
+    """Derive `metrics` from the sufficient statistics `s`, NaN where undefined."""
+    out = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name in metrics:
+            v = _FUSED_METRICS[name](s)
+            if name in ["USUTPB", "USUTPE"]:
+                v = np.where(np.isfinite(s["maxo"]), v, np.nan)
+            elif name not in ["NO", "NP", "NOP"]:
+                v = np.where(s["n"] > 0, v, np.nan)
+            out[name] = v
+    return out
+
+
+def _fused_compute(o, m, valid, metrics, total, maximum, expand):
+    """Accumulate the sufficient statistics (see :func:`_sufficient_stats`)
+    and derive `metrics` from them, NaN where undefined."""
+    ratios, second_pass = _fused_needs(metrics)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = _sufficient_stats(
+            o, m, valid, total, maximum, expand, ratios=ratios, second_pass=second_pass
+        )
+    return _derive_metrics(s, metrics)
+
+
+def compute(obs, mod, metrics=None, axis=None):
+    """Compute several statistics at once,
+    from shared sufficient statistics (counts, sums, sums of squares,
+    cross-products, absolute-difference sums).
+
+    The obs/mod masks are matched once
+    and each sum is accumulated once for all requested metrics,
+    instead of one pass over the data per metric
+    (plus a second pass for IOA, d1, E1, WDIOA and WDAC, about the observation mean).
+
+    Parameters
+    ----------
+    obs, mod : array-like
+        Observations and predictions, same shape.
+        Masked and non-finite values (in either) are excluded,
+        so that metrics are computed over the matched pairs.
+    metrics : list of str, optional
+        Metric names, as the functions of this module.
+        Default: all those available except the wind direction metrics
+        (WDMB, WDNMB_m, WDME, WDRMSE, WDIOA, WDAC and ``_m`` variants),
+        which must be requested explicitly.
+        Median-based metrics are not available.
+    axis : int or tuple of int, optional
+        Axis or axes to reduce. Default: all.
+
+    Returns
+    -------
+    dict
+        Metric name -> value (float, or numpy.ndarray if `axis` is provided),
+        NaN where undefined (e.g. no pairs).
+        Agrees with the single metric functions applied to the matched pairs
+        (see :func:`matchmasks`).
+
+    See Also
+    --------
+    compute_grouped
+    """
+    metrics = _check_fused_metrics(metrics)
+    o, m, valid = _matched_pairs(obs, mod)
+
+    def total(a, where):
+        return np.sum(a, axis=axis, where=where, keepdims=True)
+
+    def maximum(a, where):
+        return np.max(a, axis=axis, where=where, initial=-np.inf, keepdims=True)
+
+    out = _fused_compute(o, m, valid, metrics, total, maximum, lambda stat: stat)
+    for name, v in out.items():
+        v = np.squeeze(v, axis=axis)
+        out[name] = v[()] if v.ndim == 0 else v
+    return out
+
+
+def compute_grouped(obs, mod, groups, metrics=None, ngroups=None):
+    """Compute several statistics for every group at once,
+    with segment sums (:func:`numpy.bincount`)
+    instead of a Python call per group.
+
+    Parameters
+    ----------
+    obs, mod : array-like
+        Observations and predictions, same shape.
+        Masked and non-finite values (in either) are excluded.
+    groups : array-like of int
+        Group code of each element, same shape as `obs`,
+        from 0 to ``ngroups - 1``; negative codes are excluded.
+        For example, from :func:`pandas.factorize`,
+        or ``site_code * 24 + hour`` for site and hour-of-day groups.
+    metrics : list of str, optional
+        Metric names, see :func:`compute`.
+    ngroups : int, optional
+        Number of groups. Default: ``max(groups) + 1``.
+
+    Returns
+    -------
+    dict
+        Metric name -> numpy.ndarray of length `ngroups`,
+        NaN for groups without pairs.
+
+    Examples
+    --------
+    >>> codes, sites = pd.factorize(df.siteid)
+    >>> out = compute_grouped(df.obs, df.model, codes, metrics=["NMB", "RMSE"])
+    >>> pd.DataFrame(out, index=sites)
+    """
+    metrics = _check_fused_metrics(metrics)
+    o, m, valid = _matched_pairs(np.ravel(obs), np.ravel(mod))
+    groups = np.ravel(np.asarray(groups)).astype(np.intp)
+    if ngroups is None:
+        ngroups = int(groups.max()) + 1 if groups.size else 0
+    valid &= (groups >= 0) & (groups < ngroups)
+    # Excluded elements go to an extra last bin, dropped from the sums
+    codes = np.where(valid, groups, ngroups)
+
+    def total(a, where):
+        c = codes if where is valid else np.where(where, codes, ngroups)
+        if a.dtype.kind == "i":  # counts
+            return np.bincount(c, minlength=ngroups + 1)[:ngroups]
+        return np.bincount(c, weights=a, minlength=ngroups + 1)[:ngroups]
+
+    def maximum(a, where):
+        out = np.full(ngroups + 1, -np.inf)
+        np.maximum.at(out, codes if where is valid else np.where(where, codes, ngroups), a)
+        return out[:ngroups]
+
+    def expand(stat):
+        return np.append(stat, 0)[codes]
+
+    return _fused_compute(o, m, valid, metrics, total, maximum, expand)
+
+
+def compute_xarray(obs, mod, metrics=None, dim=None):
+    """Compute several statistics (see :func:`compute`) of xarray data
+    over named dimensions, lazily for dask-backed data.
+
+    Built on :func:`xarray.apply_ufunc` with ``dask='parallelized'``,
+    so for dask input each chunk is reduced in parallel
+    and nothing is computed until the result is.
+    The reduced dimension(s) must be in a single chunk
+    (e.g. chunk a year of hourly fields in space, not time).
+
+    Parameters
+    ----------
+    obs, mod : xarray.DataArray
+        Observations (e.g. reanalysis) and predictions, on the same grid.
+        NaN values (in either) are excluded.
+    metrics : list of str, optional
+        Metric names, see :func:`compute`.
+    dim : str or sequence of str, optional
+        Dimension(s) to reduce. Default: all.
+
+    Returns
+    -------
+    xarray.Dataset
+        One variable per metric,
+        with the remaining dimensions and their coordinates.
+    """
+    import xarray as xr
+
+    metrics = _check_fused_metrics(metrics)
+    if dim is None:
+        dim = list(obs.dims)
+    elif isinstance(dim, str):
+        dim = [dim]
+    dim = list(dim)
+    axis = tuple(range(-len(dim), 0))
+
+    def func(o, m):
+        out = compute(o, m, metrics=metrics, axis=axis)
+        out = tuple(np.asarray(out[name]) for name in metrics)
+        return out if len(out) > 1 else out[0]
+
+    results = xr.apply_ufunc(
+        func,
+        obs,
+        mod,
+        input_core_dims=[dim, dim],
+        output_core_dims=[[] for _ in metrics],
+        dask="parallelized",
+        output_dtypes=[np.int64 if name in ["NO", "NP", "NOP"] else np.float64 for name in metrics],
+    )
+    if len(metrics) == 1:
+        results = (results,)
+
+    ds = xr.Dataset()
+    for name, result in zip(metrics, results):
+        doc = getattr(globals().get(name), "__doc__", None)
+        if doc:
+            result.attrs["long_name"] = doc.strip().splitlines()[0]
+        ds[name] = result.rename(name)
+    return ds
+
+
+# Median metrics available in `StatsAccumulator`:
+# name -> (quantities, derivation from their medians `q`), see `_median_values`
+_MEDIAN_METRICS = {
+    "MdnO": (["o"], lambda q: q["o"]),
+    "MdnP": (["m"], lambda q: q["m"]),
+    "MdnB": (["d"], lambda q: q["d"]),
+    "MdnE": (["ad"], lambda q: q["ad"]),
+    "NMdnB": (["d", "o"], lambda q: q["d"] / q["o"] * 100.0),
+    "NMdnE": (["ad", "o"], lambda q: q["ad"] / q["o"] * 100.0),
+    "MdnNB": (["nb"], lambda q: q["nb"] * 100.0),
+    "MdnNE": (["ne"], lambda q: q["ne"] * 100.0),
+    "RMdn": (["rm"], lambda q: q["rm"]),
+    "WDMdnB": (["wd"], lambda q: q["wd"]),
+    "WDMdnE": (["wad"], lambda q: q["wad"]),
+}
+
+
+def _median_values(o, m, valid, keys):
+    """The valid values of the quantities `keys`
+    whose medians give `_MEDIAN_METRICS`."""
+    d = m - o
+    out = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for key in keys:
+            if key == "o":
+                v = o
+            elif key == "m":
+                v = m
+            elif key == "d":
+                v = d
+            elif key == "ad":
+                v = np.abs(d)
+            elif key == "nb":
+                v = d / o
+            elif key == "ne":
+                v = np.abs(d) / o
+            elif key == "rm":
+                v = o / m
+            elif key == "wd":
+                v = circlebias_m(d)
+            elif key == "wad":
+                v = np.abs(circlebias_m(d))
+            v = v[valid]
+            out[key] = v[np.isfinite(v)]
+    return out
+
+
+class QuantileSketch:
+    """Mergeable KLL quantile sketch
+    (Karnin, Lang and Liberty, 2016, https://arxiv.org/abs/1603.05346),
+    for approximate quantiles of a stream in bounded memory.
+
+    The sketch keeps about ``3 * k`` values
+    (plus ``O(log(n / k))`` levels of at most 2 values),
+    whatever the number `n` of values added.
+    The rank error of a quantile is about ``1.7 / k`` of `n`
+    (99% confidence; e.g. within 0.85% for the default ``k=200``:
+    the median returned is between the 49.15% and 50.85% quantiles),
+    also for sketches merged from separate chunks.
+
+    Parameters
+    ----------
+    k : int
+        Accuracy parameter.
+    seed : int, optional
+        Seed for the random compactions.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} k={self.k} n={self.n} size={self.size}>"
+
+    @property
+    def size(self):
+        """Number of values retained."""
+        return sum(level.size for level in self.levels)
+
+    def _capacity(self, h):
+        return max(int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - h))), 2)
+
+    def _compress(self):
+        while self.size > sum(self._capacity(h) for h in range(len(self.levels))):
+            h = next(h for h, level in enumerate(self.levels) if level.size > self._capacity(h))
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            level = np.sort(self.levels[h])
+            # Keep one value if odd, and promote every other value (random offset)
+            # with twice the weight
+            keep = level[level.size - level.size % 2 :]
+            promoted = level[self._rng.integers(2) : level.size - keep.size : 2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, values):
+        """Add `values` (NaN are ignored).
+
+        Returns
+        -------
+        QuantileSketch
+            self
+        """
+        values = np.ravel(np.asarray(values, dtype=np.float64))
+        values = values[~np.isnan(values)]
+        self.n += values.size
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Add the values of sketch `other` (with the same `k`).
+
+        Returns
+        -------
+        QuantileSketch
+            self
+        """
+        if other.k != self.k:
+            raise ValueError(f"can only merge sketches with the same k, got {other.k} != {self.k}")
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Approximate quantile(s) `q` (in [0, 1]) of the values added,
+        NaN if none."""
+        values = np.concatenate(self.levels)
+        if values.size == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        weights = np.concatenate(
+            [np.full(level.size, 2.0**h) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(values)
+        cum = np.cumsum(weights[order])
+        i = np.searchsorted(cum, np.asarray(q) * cum[-1], side="left")
+        return values[order][np.minimum(i, values.size - 1)]
+
+
+class _ExactQuantiles:
+    """Exact counterpart of :class:`QuantileSketch`, keeping all values."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def update(self, values):
+        values = np.ravel(np.asarray(values, dtype=np.float64))
+        self.chunks.append(values[~np.isnan(values)])
+        return self
+
+    def merge(self, other):
+        self.chunks.extend(other.chunks)
+        return self
+
+    def quantile(self, q):
+        values = np.concatenate(self.chunks) if self.chunks else np.empty(0)
+        if values.size == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        return np.quantile(values, q)
+
+
+class StatsAccumulator:
+    """Mergeable accumulator of the sufficient statistics of :func:`compute`,
+    for data that doesn't fit in memory at once.
+
+    Feed it chunks of pairs with :meth:`update`,
+    combine accumulators of different chunks (e.g. from process pool or dask
+    workers) with :meth:`merge`,
+    and get the metrics with :meth:`result`.
+    The result is the same as :func:`compute` on all the pairs
+    (up to floating-point summation order).
+
+    Metrics about the observation mean
+    (IOA, d1, E1, WDIOA and WDAC)
+    need the overall observation mean upfront, as `obs_mean`:
+    e.g. ``MO`` from a first accumulation,
+    with a second accumulation over the data for these metrics.
+
+    Median metrics (MdnO, MdnP, MdnB, MdnE, NMdnB, NMdnE, MdnNB, MdnNE, RMdn,
+    WDMdnB, WDMdnE) are exact by default, which keeps all the values,
+    or approximate in bounded memory with ``median='sketch'``
+    (see :class:`QuantileSketch` for the error bound).
+
+    Parameters
+    ----------
+    metrics : list of str, optional
+        Metric names, see :func:`compute`, and the median metrics above.
+        Default: those of :func:`compute`.
+    obs_mean : float, optional
+        Overall observation mean, required for the metrics above.
+    median : {'exact', 'sketch'}
+        Median mode.
+    k : int
+        :class:`QuantileSketch` accuracy parameter, for ``median='sketch'``.
+    seed : int, optional
+        :class:`QuantileSketch` seed, for ``median='sketch'``.
+
+    Examples
+    --------
+    >>> acc = StatsAccumulator(["MB", "RMSE", "NMB", "R", "MdnB"], median="sketch")
+    >>> for obs, mod in chunks:
+    ...     acc.update(obs, mod)
+    >>> acc.result()
+    """
+
+    def __init__(self, metrics=None, obs_mean=None, median="exact", k=200, seed=None):
+        if metrics is None:
+            metrics = list(_FUSED_DEFAULT)
+        unknown = [n for n in metrics if n not in _FUSED_METRICS and n not in _MEDIAN_METRICS]
+        if unknown:
+            raise ValueError(
+                f"metric(s) {unknown} not available, choose from "
+                f"{list(_FUSED_METRICS) + list(_MEDIAN_METRICS)}"
+            )
+        if median not in ["exact", "sketch"]:
+            raise ValueError(f"median must be 'exact' or 'sketch', got {median!r}")
+        self.metrics = list(metrics)
+        self.obs_mean = obs_mean
+        self.median = median
+        fused = [name for name in self.metrics if name in _FUSED_METRICS]
+        self._ratios, self._second_pass = _fused_needs(fused)
+        if self._second_pass and obs_mean is None:
+            raise ValueError(
+                f"obs_mean is required for {sorted(_FUSED_METRICS_2.intersection(self.metrics))}"
+            )
+        keys = {
+            key
+            for name in self.metrics
+            if name in _MEDIAN_METRICS
+            for key in _MEDIAN_METRICS[name][0]
+        }
+        self.quantiles = {
+            key: QuantileSketch(k, seed) if median == "sketch" else _ExactQuantiles()
+            for key in sorted(keys)
+        }
+        self.stats = self._accumulate(*_matched_pairs(np.empty(0), np.empty(0)))
+
+    def __repr__(self):
+        return f"<{type(self).__name__} metrics={self.metrics} n={self.stats['n']}>"
+
+    def _accumulate(self, o, m, valid):
+        def total(a, where):
+            return np.sum(a, where=where)
+
+        def maximum(a, where):
+            return np.max(a, where=where, initial=-np.inf)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _sufficient_stats(
+                o,
+                m,
+                valid,
+                total,
+                maximum,
+                None,
+                ratios=self._ratios,
+                second_pass=self._second_pass,
+                obs_mean=self.obs_mean,
+            )
+
+    def _add(self, stats):
+        for key, value in stats.items():
+            if key.startswith("max"):
+                self.stats[key] = np.maximum(self.stats[key], value)
+            else:
+                self.stats[key] = self.stats[key] + value
+
+    def update(self, obs, mod):
+        """Accumulate a chunk of pairs.
+
+        Parameters
+        ----------
+        obs, mod : array-like
+            Observations and predictions, same shape.
+            Masked and non-finite values (in either) are excluded.
+
+        Returns
+        -------
+        StatsAccumulator
+            self
+        """
+        o, m, valid = _matched_pairs(np.ravel(obs), np.ravel(mod))
+        self._add(self._accumulate(o, m, valid))
+        for key, values in _median_values(o, m, valid, self.quantiles).items():
+            self.quantiles[key].update(values)
+        return self
+
+    def merge(self, other):
+        """Add the statistics accumulated by `other`.
+
+        Parameters
+        ----------
+        other : StatsAccumulator
+            With the same metrics, `obs_mean` and `median` mode.
+
+        Returns
+        -------
+        StatsAccumulator
+            self
+        """
+        if (other.metrics, other.obs_mean, other.median) != (
+            self.metrics,
+            self.obs_mean,
+            self.median,
+        ):
+            raise ValueError(
+                "can only merge accumulators with the same metrics, obs_mean and median mode"
+            )
+        self._add(other.stats)
+        for key, quantiles in other.quantiles.items():
+            self.quantiles[key].merge(quantiles)
+        return self
+
+    def result(self):
+        """The metrics of all accumulated pairs.
+
+        Returns
+        -------
+        dict
+            Metric name -> value, NaN where undefined (e.g. no pairs).
+        """
+        fused = [name for name in self.metrics if name in _FUSED_METRICS]
+        out = {name: v[()] for name, v in _derive_metrics(self.stats, fused).items()}
+        medians = {key: quantiles.quantile(0.5) for key, quantiles in self.quantiles.items()}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for name in self.metrics:
+                if name in _MEDIAN_METRICS:
+                    out[name] = _MEDIAN_METRICS[name][1](medians)
+        return {name: out[name] for name in self.metrics}
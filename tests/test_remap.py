@@ -1,3 +1,5 @@
+import os
+
 import numpy as np
 import pytest
 import xarray as xr
@@ -108,3 +110,837 @@ def test_combine_da_da():
     assert a.shape == (model.dims["z"], n), "model levels but obs grid points"
     assert (np.diff(a.mean(axis=0)) >= 0).all(), "obs profile goes S"
     assert np.isclose(np.diff(a.mean(axis=1)), 1, atol=1e-15, rtol=0).all(), "obs profile goes U"
+
+
+def _make_grid(lon, lat, *, name="data", nt=2):
+    return monet.dataset_to_monet(
+        xr.DataArray(
+            np.arange(nt * lat.size * lon.size, dtype=float).reshape((nt, lat.size, lon.size)),
+            dims=("time", "lat", "lon"),
+            coords={"lat": lat, "lon": lon},
+            name=name,
+        )
+    )
+
+
+def test_remap_nearest_cache(tmp_path):
+    from monet.util.resample import NeighbourInfoCache
+
+    source = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30))
+    target = _make_grid(np.linspace(-110, -80, 20), np.linspace(30, 45, 10), nt=1).isel(time=0)
+
+    cache = NeighbourInfoCache(maxsize=1, cache_dir=tmp_path)
+    expected = target.monet.remap_nearest(source, cache=False).compute()
+    a = target.monet.remap_nearest(source, cache=cache).compute()
+    b = target.monet.remap_nearest(source, cache=cache).compute()
+    assert cache.cache_info()[:2] == (1, 1)
+    xr.testing.assert_identical(a, expected)
+    xr.testing.assert_identical(b, expected)
+
+    # Different settings -> new entry, evicting the first (maxsize=1)
+    target.monet.remap_nearest(source, cache=cache, radius_of_influence=5e4)
+    assert cache.cache_info() == (1, 2, 1, 1)
+
+    # But the first is still on disk
+    cache = NeighbourInfoCache(cache_dir=tmp_path)
+    c = target.monet.remap_nearest(source, cache=cache).compute()
+    assert cache.hits == 1
+    xr.testing.assert_identical(c, expected)
+
+
+def test_nearest_ij_batch():
+    da = _make_grid(np.linspace(-120, -70, 51), np.linspace(25, 50, 26), nt=1).isel(time=0)
+
+    # Scalar in, scalar out
+    x, y = da.monet.nearest_ij(lat=30.2, lon=-99.9)
+    assert (x, y) == (20, 5)
+
+    # Arrays in, arrays out, index built once and cached on the accessor
+    lat = np.array([30.2, 49.6, 0.0])
+    lon = np.array([-99.9, -70.4, 0.0])
+    x, y, d = da.monet.nearest_ij(lat=lat, lon=lon, radius_of_influence=1e5, return_distance=True)
+    index = da.monet._lonlat_index
+    da.monet.nearest_ij(lat=lat, lon=lon)
+    assert da.monet._lonlat_index is index
+    assert x.tolist() == [20, 50, -1]
+    assert y.tolist() == [5, 25, -1]
+    assert np.isnan(d[-1]) and (d[:2] < 6e4).all()
+
+
+def test_remap_nearest_unstructured():
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    ncell, nz, nt = 2000, 3, 2
+    cell_lat = rng.uniform(-89, 89, ncell)
+    cell_lon = rng.uniform(-180, 180, ncell)
+    cell_lat[(np.abs(cell_lat) < 5) & (np.abs(cell_lon) < 5)] = 10  # no cells near (0, 0)
+    model = xr.Dataset(
+        data_vars={
+            "a": (("time", "lev", "cell"), rng.random((nt, nz, ncell))),
+            "b": (("time", "cell"), rng.random((nt, ncell))),
+            "latitude": ("cell", cell_lat),
+            "longitude": ("cell", cell_lon),
+        },
+        coords={"time": pd.date_range("2020-01-01", periods=nt, freq="h")},
+        attrs={"mio_has_unstructured_grid": True},
+    )
+    # Sites exactly on cells, one with longitude shifted by 360
+    i = np.array([0, 10, 100])
+    site_lon = cell_lon[i].copy()
+    site_lon[0] = site_lon[0] + 360 if site_lon[0] < 0 else site_lon[0] - 360
+    # Plus one far from any cell (for the radius test)
+    sites = pd.DataFrame({"latitude": np.r_[cell_lat[i], 0], "longitude": np.r_[site_lon, 0]})
+    obs = sites.monet._df_to_da()
+
+    out = obs.monet.remap_nearest_unstructured(model, return_distance=True)
+    assert out.a.dims == ("time", "z", "y", "x")
+    assert out.b.dims == ("time", "y", "x")
+    np.testing.assert_array_equal(out.a.values[..., 0, :3], model.a.values[..., i])
+    np.testing.assert_array_equal(out.b.values[..., 0, :3], model.b.values[..., i])
+    assert np.allclose(out.distance.values[0, :3], 0, atol=1e-3)
+
+    out = obs.monet.remap_nearest_unstructured(model, radius_of_influence=1.0)
+    assert out.a.isel(x=slice(None, 3)).notnull().all()
+    assert out.a.isel(x=3).isnull().all()
+
+
+def test_remap_nearest_dataset_single_gather():
+    from monet.util.resample import nearest_neighbour_resampler
+
+    a = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), name="a")
+    source = a.to_dataset()
+    source["b"] = (a * 2).astype("float32")
+    source["c"] = a.isel(time=0) + 1
+    source["n"] = (("y", "x"), np.ones(a.shape[1:], dtype=int))
+    target = _make_grid(np.linspace(-110, -80, 20), np.linspace(30, 45, 10), nt=1).to_dataset()
+
+    out = target.monet.remap_nearest(source, radius_of_influence=2e5)
+    assert list(out.data_vars) == ["a", "b", "c", "n"]
+    assert out.b.dtype == "float32"
+
+    r = nearest_neighbour_resampler(source, target, cache=False, radius_of_influence=2e5)
+    for name in source.data_vars:
+        expected = r.get_sample_from_neighbour_info(source[name])
+        np.testing.assert_array_equal(out[name].values, expected.values)
+        assert out[name].dims == expected.dims
+
+
+def test_remap_nearest_df():
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    source = pd.DataFrame(
+        {
+            "latitude": rng.uniform(30, 40, 200),
+            "longitude": rng.uniform(-100, -90, 200),
+            "siteid": [f"s{i}" for i in range(200)],
+            "pm25": rng.random(200),
+        }
+    )
+    target = pd.DataFrame(
+        {"latitude": [35.0, 35.5, 0.0], "longitude": [-95.0, -92.0, 0.0], "obs": [1, 2, 3]},
+        index=[10, 11, 12],
+    )
+
+    # Brute force
+    d2 = (source.latitude.values - target.latitude.values[:, None]) ** 2 + (
+        (source.longitude.values - target.longitude.values[:, None])
+        * np.cos(np.deg2rad(target.latitude.values[:, None]))
+    ) ** 2
+    expected = d2.argmin(axis=1)[:2]
+
+    out = target.monet.remap_nearest(source, radius_of_influence=1e5, return_distance=True)
+    assert out.index.tolist() == [0, 1, 2]
+    assert out.siteid.tolist()[:2] == source.siteid.values[expected].tolist()
+    assert out.iloc[2].isnull().all()
+    assert (out.distance[:2] < 1e5).all()
+    assert "monet_fake_index" not in source.columns
+
+    out = target.monet.remap_nearest(source, radius_of_influence=1e5, combine=True)
+    assert out.index.tolist() == target.index.tolist()
+    assert out.obs.tolist() == [1, 2, 3]
+    assert out.pm25.tolist()[:2] == source.pm25.values[expected].tolist()
+
+
+def test_remapper_nearest(tmp_path):
+    import pickle
+
+    from monet.util.resample import load_remapper
+
+    source = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=3)
+    target = _make_grid(np.linspace(-110, -80, 20), np.linspace(30, 45, 10), nt=1).isel(time=0)
+
+    remapper = target.monet.build_remapper(source, radius_of_influence=2e5)
+    remapper = pickle.loads(pickle.dumps(remapper))
+    expected = target.monet.remap_nearest(source, radius_of_influence=2e5)
+
+    da = remapper(source)
+    assert da.name == source.name
+    np.testing.assert_array_equal(da.values, expected.values)
+
+    ds = source.to_dataset()
+    ds["n"] = (("y", "x"), np.ones(source.shape[1:], dtype=int))
+    out = remapper(ds.chunk({"time": 1}))
+    assert out.data.chunks == ((1, 1, 1), (10,), (20,))
+    np.testing.assert_array_equal(out.data.values, expected.values)
+    assert (out.n == 1).all()
+
+    remapper.save(tmp_path / "remapper.pkl")
+    np.testing.assert_array_equal(load_remapper(tmp_path / "remapper.pkl")(source), da)
+
+    with pytest.raises(ValueError, match="does not match"):
+        remapper(target)
+
+
+def test_remap_nearest_idw():
+    from monet.util.interp_util import LonLatIndex
+    from monet.util.resample import NeighbourInfoCache, _idw_weights
+
+    source = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=2)
+    source[0, 5, 5] = np.nan
+    target = _make_grid(np.linspace(-110, -80, 20), np.linspace(30, 45, 10), nt=1).isel(time=0)
+
+    out = target.monet.remap_nearest(source, neighbours=4, radius_of_influence=2e5)
+    assert out.shape == (2, 10, 20)
+
+    # Reference: explicit weighted mean over the non-NaN neighbours
+    d, i = LonLatIndex(source.longitude.values, source.latitude.values).query(
+        target.longitude.values, target.latitude.values, k=4, radius_of_influence=2e5
+    )
+    w = _idw_weights(d)
+    vals = source.values.reshape(2, -1)[:, i]
+    w = np.where(np.isnan(vals), 0, w)
+    expected = np.nansum(vals * w, axis=-1) / w.sum(axis=-1)
+    np.testing.assert_allclose(out.values, expected)
+    assert not np.isnan(out.values).any()
+
+    # Coincident points take the source value
+    same = target.monet.remap_nearest(target.expand_dims("time"), neighbours=4)
+    np.testing.assert_allclose(same.values[0], target.values)
+
+    ds = target.monet.remap_nearest(source.to_dataset(), neighbours=4, radius_of_influence=2e5)
+    np.testing.assert_allclose(ds.data.values, expected)
+
+    # Options of the pyresample nearest path are rejected, not dropped
+    with pytest.raises(TypeError, match=r"unsupported option\(s\) \['epsilon'\]"):
+        target.monet.remap_nearest(source, neighbours=4, epsilon=0.5)
+    with pytest.raises(TypeError, match="NeighbourInfoCache"):
+        target.to_dataset().monet.remap_nearest(source, neighbours=4, cache=NeighbourInfoCache())
+
+
+def test_xesmf_weight_cache_key_evict(tmp_path):
+    import os
+    import time
+
+    from monet.util.resample import XESMFWeightCache
+
+    cache = XESMFWeightCache(cache_dir=tmp_path, max_bytes="2kB")
+    grid = xr.Dataset(coords={"lat": np.arange(10.0), "lon": np.arange(20.0)})
+    key = cache.key(grid, grid, "bilinear", periodic=False)
+    assert key == cache.key(grid.copy(deep=True), grid, "bilinear", periodic=False)
+    assert key != cache.key(grid, grid, "conservative", periodic=False)
+    assert key != cache.key(grid, grid.assign_coords(lat=grid.lat + 1), "bilinear", periodic=False)
+
+    paths = [cache.path(str(i)) for i in range(3)]
+    for i, path in enumerate(paths):
+        with open(path, "wb") as f:
+            f.write(b"\0" * 1000)
+        os.utime(path, (time.time() - 100 + i,) * 2)
+    os.utime(paths[0])  # most recently used
+    for i in range(3):
+        with cache._lock(str(i)):
+            pass
+    cache.evict()
+    assert [os.path.isfile(p) for p in paths] == [True, False, True]
+    assert cache.cache_info().currsize == 2
+    assert not os.path.exists(tmp_path / ".1.lock"), "lock file removed with the entry"
+
+    # Entries in use elsewhere are not evicted
+    with open(paths[1], "wb") as f:
+        f.write(b"\0" * 1000)
+    os.utime(paths[1], (time.time() - 200,) * 2)
+    with cache._lock("1"):
+        cache.evict()
+    assert [os.path.isfile(p) for p in paths] == [True, True, False]
+
+    cache.clear()
+    assert cache.cache_info().currsize == 0
+    assert not [fn for fn in os.listdir(tmp_path) if fn.endswith(".lock")]
+
+
+def test_remap_xesmf_dataset_batched():
+    pytest.importorskip("xesmf")
+
+    source = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=3).to_dataset()
+    for i in range(5):
+        source[f"v{i}"] = source.data + i
+    target = _make_grid(np.linspace(-110, -80, 20), np.linspace(30, 45, 10), nt=1).to_dataset()
+    target_vars = list(target.variables)
+
+    out = target.monet._remap_xesmf_dataset(source.rename(latitude="lat", longitude="lon"))
+    assert list(target.variables) == target_vars, "target not modified"
+    assert set(out.data_vars) == {"data_y", "v0", "v1", "v2", "v3", "v4"}
+    for i in range(5):
+        np.testing.assert_allclose(out[f"v{i}"], out.data_y + i)
+
+    new = target.monet.remap_xesmf(source, inplace=False)
+    assert list(target.variables) == target_vars, "target not modified"
+    assert np.shares_memory(new.data.values, target.data.values), "target data not copied"
+    np.testing.assert_allclose(new.v0, out.v0)
+
+
+def test_remap_streaming(tmp_path):
+    source = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=12)
+    source = source.expand_dims(z=5, axis=1).copy() * np.arange(1, 6)[:, None, None]
+    target = _make_grid(np.linspace(-110, -80, 20), np.linspace(30, 45, 10), nt=1).isel(time=0)
+    expected = target.monet.build_remapper(source)(source)
+
+    # One (y, x) slice in + out (+ temporaries) is about 15 kB
+    out = target.monet.remap_streaming(
+        source.to_dataset(), tmp_path / "out.nc", max_memory=160_000 * os.cpu_count()
+    )
+    assert out.data.chunks[:2] == ((2,) * 6, (5,))
+    with xr.open_dataset(tmp_path / "out.nc") as ds:
+        np.testing.assert_array_equal(ds.data.values, expected.values)
+
+    out = target.monet.remap_streaming(source, max_memory=20_000 * os.cpu_count())
+    assert out.chunks[:2] == ((1,) * 12, (1,) * 5)
+    np.testing.assert_array_equal(out.values, expected.values)
+
+
+def test_combine_files_to_df(tmp_path):
+    import pandas as pd
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from monet.util.combinetool import (
+        _iter_combine_files_parallel,
+        combine_da_to_df,
+        combine_files_to_df,
+    )
+
+    times = pd.date_range("2020-07-01", periods=12, freq="h")
+    model = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=12)
+    model = model.assign_coords(time=times).to_dataset()
+    for i in range(3):
+        model.isel(time=slice(4 * i, 4 * i + 4)).to_netcdf(tmp_path / f"model_{i}.nc")
+
+    rs = np.random.default_rng(0)
+    sites = pd.DataFrame(
+        {
+            "siteid": [f"s{i}" for i in range(20)],
+            "latitude": rs.uniform(30, 45, 20),
+            "longitude": rs.uniform(-110, -80, 20),
+        }
+    )
+    obs = sites.merge(pd.DataFrame({"time": times}), how="cross")
+    obs["obs"] = rs.random(len(obs))
+    obs = obs.sample(frac=1, random_state=0)
+
+    expected = combine_da_to_df(model, obs, radius_of_influence=1e5)
+    expected = expected.sort_values(["time", "siteid"], ignore_index=True)
+
+    out = combine_files_to_df(str(tmp_path / "model_*.nc"), obs, radius_of_influence=1e5)
+    out = out.sort_values(["time", "siteid"], ignore_index=True)
+    pd.testing.assert_frame_equal(out[expected.columns], expected)
+
+    combine_files_to_df(
+        str(tmp_path / "model_*.nc"),
+        obs,
+        path=tmp_path / "paired.csv",
+        merge=False,
+        radius_of_influence=1e5,
+    )
+    paired = pd.read_csv(tmp_path / "paired.csv")
+    assert len(paired) == len(obs)
+    np.testing.assert_allclose(np.sort(paired.data), np.sort(expected.data))
+
+    model["data2"] = model.data * 2
+    for i in range(3):
+        model.isel(time=slice(4 * i, 4 * i + 4)).to_netcdf(tmp_path / f"model2_{i}.nc")
+    for executor in ["thread", "process"]:
+        out = combine_files_to_df(
+            str(tmp_path / "model2_*.nc"),
+            obs,
+            executor=executor,
+            max_workers=2,
+            split_variables=True,
+            radius_of_influence=1e5,
+        )
+        out = out.sort_values(["time", "siteid"], ignore_index=True)
+        pd.testing.assert_frame_equal(out[expected.columns], expected)
+        np.testing.assert_array_equal(out.data2, 2 * out.data)
+    with pytest.raises(ValueError, match="merge=False is not supported with an executor"):
+        combine_files_to_df(str(tmp_path / "model2_*.nc"), obs, executor="thread", merge=False)
+
+    # At most 2 x max_workers files in flight: results are not all held at once
+    class CountingExecutor(ThreadPoolExecutor):
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            CountingExecutor.submitted += 1
+            return super().submit(*args, **kwargs)
+
+    with CountingExecutor(1) as pool:
+        chunks = _iter_combine_files_parallel(
+            str(tmp_path / "model2_*.nc"), obs, executor=pool, radius_of_influence=1e5
+        )
+        next(chunks)
+        assert CountingExecutor.submitted == 2
+        assert len(list(chunks)) == 2
+        assert CountingExecutor.submitted == 3
+
+
+def test_combine_files_to_df_unstructured(tmp_path, monkeypatch):
+    import pandas as pd
+
+    import monet.monet_accessor
+    from monet.util.combinetool import combine_files_to_df
+
+    rng = np.random.default_rng(0)
+    ncell, nz = 500, 2
+    times = pd.date_range("2020-07-01", periods=6, freq="h")
+    model = xr.Dataset(
+        data_vars={
+            "a": (("time", "lev", "cell"), rng.random((times.size, nz, ncell))),
+            "latitude": ("cell", rng.uniform(-80, 80, ncell)),
+            "longitude": ("cell", rng.uniform(-180, 180, ncell)),
+        },
+        coords={"time": times},
+    )
+    for i in range(3):
+        model.isel(time=slice(2 * i, 2 * i + 2)).to_netcdf(tmp_path / f"mesh_{i}.nc")
+
+    def open_func(fn):
+        return xr.open_dataset(fn).assign_attrs(mio_has_unstructured_grid=True)
+
+    cell = np.array([3, 30, 300])
+    sites = pd.DataFrame(
+        {
+            "siteid": ["a", "b", "c"],
+            "latitude": model.latitude.values[cell],
+            "longitude": model.longitude.values[cell],
+        }
+    )
+    obs = sites.merge(pd.DataFrame({"time": times}), how="cross")
+
+    calls = []
+    unstructured_cells = monet.monet_accessor._unstructured_cells
+
+    def counting_unstructured_cells(*args, **kwargs):
+        calls.append(1)
+        return unstructured_cells(*args, **kwargs)
+
+    monkeypatch.setattr(monet.monet_accessor, "_unstructured_cells", counting_unstructured_cells)
+    out = combine_files_to_df(str(tmp_path / "mesh_*.nc"), obs, open_func=open_func)
+    assert len(calls) == 1, "one neighbour search per mesh"
+    # First model level at the sites' cells
+    expected = model.a.values[:, 0, cell].ravel()
+    out = out.sort_values(["time", "siteid"], ignore_index=True)
+    np.testing.assert_array_equal(out.a, expected)
+
+
+def test_combine_da_to_df_time_interp():
+    import pandas as pd
+
+    from monet.util.combinetool import combine_da_to_df
+
+    times = pd.date_range("2020-07-01", periods=4, freq="h")
+    model = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=4)
+    model = model.assign_coords(time=times)
+    obs = pd.DataFrame(
+        {
+            "siteid": ["a", "a", "b", "b", "b"],
+            "latitude": [30.0, 30.0, 40.0, 40.0, 40.0],
+            "longitude": [-100.0, -100.0, -90.0, -90.0, -90.0],
+            "time": pd.to_datetime(
+                [
+                    "2020-07-01 00:30",
+                    "2020-07-01 03:00",
+                    "2020-07-01 01:10",
+                    "2020-07-01 02:40",
+                    "2020-07-01 04:00",
+                ]
+            ),
+        }
+    )
+    exact = combine_da_to_df(model, obs, radius_of_influence=1e5)
+    assert exact.data.isnull().sum() == 4
+
+    # Model values at the sites
+    at_sites = combine_da_to_df(model, obs, merge=False, radius_of_influence=1e5)
+    at_sites = at_sites.pivot(index="time", columns="siteid", values="data")
+    a, b = at_sites["a"].values, at_sites["b"].values
+
+    # 04:00 is after the last model time (03:00): not extrapolated
+    near = combine_da_to_df(model, obs, time_interp="nearest", radius_of_influence=1e5)
+    np.testing.assert_array_equal(near.data, [a[0], a[3], b[1], b[3], np.nan])
+    near = combine_da_to_df(
+        model, obs, time_interp="nearest", time_tolerance="30min", radius_of_influence=1e5
+    )
+    np.testing.assert_array_equal(near.data, [a[0], a[3], b[1], b[3], np.nan])
+
+    lin = combine_da_to_df(model, obs, time_interp="linear", radius_of_influence=1e5)
+    expected = [
+        (a[0] + a[1]) / 2,
+        a[3],
+        b[1] + (b[2] - b[1]) / 6,
+        b[2] + (b[3] - b[2]) * 2 / 3,
+        np.nan,
+    ]
+    np.testing.assert_allclose(lin.data, expected)
+    assert (lin.index == obs.index).all()
+
+
+def test_combine_da_to_df_take():
+    import pandas as pd
+
+    from monet.util.combinetool import combine_da_to_df
+
+    times = pd.date_range("2020-07-01", periods=3, freq="h")
+    model = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=3)
+    model = model.assign_coords(time=times)
+    obs = pd.DataFrame(
+        {
+            "siteid": ["b", "a", "b", "c", "a"],
+            "latitude": [40.0, 30.0, 40.0, 35.0, 30.0],
+            "longitude": [-90.0, -100.0, -90.0, -95.0, -100.0],
+            # (no model data for the last one)
+            "time": times[[2, 0, 0, 1]].append(pd.DatetimeIndex(["2020-07-02"])),
+            "data": 1.0,
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+    at_sites = combine_da_to_df(model, obs, merge=False, radius_of_influence=1e5)
+    expected = obs.merge(
+        at_sites.rename(columns={"data": "data_new"}), on=["time", "siteid"], how="left"
+    )
+    out = combine_da_to_df(model, obs, radius_of_influence=1e5)
+    pd.testing.assert_frame_equal(out, expected)
+    assert np.isnan(out.data_new.iloc[4])
+
+    # Multiple levels fall back to merging, one row per level
+    model4 = model.expand_dims(z=2, axis=1).copy()
+    out = combine_da_to_df(model4, obs, radius_of_influence=1e5)
+    assert len(out) == 2 * 4 + 1
+
+
+def test_site_table():
+    import pandas as pd
+
+    from monet.util.combinetool import SiteTable
+
+    df = pd.DataFrame(
+        {
+            "latitude": [30.0, 40.0, 30.000000001, np.nan, 50.0],
+            "longitude": [-100.0, -90.0, -100.0, -80.0, -70.0],
+        }
+    )
+    sites = SiteTable(df)
+    assert len(sites) == 3
+    np.testing.assert_array_equal(sites.codes, [0, 1, 0, -1, 2])
+    np.testing.assert_array_equal(sites.latitude, [30, 40, 50])
+    np.testing.assert_array_equal(sites.get_indexer(df.iloc[::-1]), [2, -1, 0, 1, 0])
+    assert sites.target.lat.shape == (3, 1)
+
+    df["siteid"] = ["a", "b", "a", "c", "d"]
+    sites = SiteTable(df)
+    assert list(sites.keys) == ["a", "b", "d"]
+    np.testing.assert_array_equal(sites.codes, [0, 1, 0, -1, 2])
+
+
+def test_combine_da_to_df_xesmf_sites():
+    pytest.importorskip("xesmf")
+    import pandas as pd
+
+    from monet.util.combinetool import SiteTable, combine_da_to_df_xesmf
+
+    times = pd.date_range("2020-07-01", periods=3, freq="h")
+    model = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=3)
+    model = model.assign_coords(time=times)
+    obs = pd.DataFrame(
+        {
+            "siteid": ["b", "a", "b", "a"],
+            "latitude": [40.0, 30.0, 40.0, 30.0 + 1e-9],
+            "longitude": [-90.0, -100.0, -90.0, -100.0],
+            "time": times[[2, 0, 0, 1]],
+        }
+    )
+    sites = SiteTable(obs)
+    out = combine_da_to_df_xesmf(model, obs, sites=sites, method="bilinear")
+    again = combine_da_to_df_xesmf(model, obs.iloc[::-1], sites=sites, method="bilinear")
+    assert out.data.notnull().all()
+    np.testing.assert_array_equal(again.data.values, out.data.values[::-1])
+
+
+def test_combine_da_to_df_track():
+    import pandas as pd
+
+    from monet.util.combinetool import combine_da_to_df_track
+
+    lon, lat = np.linspace(-120, -70, 50), np.linspace(25, 50, 30)
+    times = pd.date_range("2020-07-01", periods=4, freq="h")
+    nz = 6
+    # Linear in time and height, with a different offset for each cell
+    t = np.arange(4.0)[:, None, None, None]
+    cell = np.arange(lat.size * lon.size, dtype=float).reshape(1, 1, lat.size, lon.size)
+    height = (np.arange(nz) * 1000.0)[None, :, None, None] + 0.1 * cell + 10 * t
+    data = 5 * t + 0.01 * height + cell
+    coords = {"time": times, "lat": lat, "lon": lon}
+    dims = ("time", "z", "lat", "lon")
+    da = monet.dataset_to_monet(xr.DataArray(data, dims=dims, coords=coords, name="o3"))
+    daz = monet.dataset_to_monet(
+        xr.DataArray(height + 0 * data, dims=dims, coords=coords, name="height")
+    )
+
+    rs = np.random.default_rng(0)
+    n = 1000
+    iy, ix = rs.integers(0, lat.size, n), rs.integers(0, lon.size, n)
+    dt = rs.uniform(0, 3, n)
+    df = pd.DataFrame(
+        {
+            "time": times[0] + pd.to_timedelta(dt, unit="h"),
+            "latitude": lat[iy] + 0.1,
+            "longitude": lon[ix] - 0.1,
+            "altitude": rs.uniform(500, 4500, n),
+            "o3": 1.0,
+        }
+    )
+    df.loc[0, "time"] = times[-1] + pd.Timedelta("1h")  # out of range
+
+    out = combine_da_to_df_track(da, daz, df, batch_size=100)
+    c = (iy * lon.size + ix).astype(float)
+    # Model data at a given height is linear in time,
+    # height itself too, so data(h) = 5 t + 0.01 h + c exactly
+    expected = 5 * dt + 0.01 * df.altitude.values + c
+    expected[0] = np.nan
+    np.testing.assert_allclose(out.o3_new.values, expected)
+    assert (out.o3 == 1).all()
+
+    # Lazy model data: only the needed columns are read
+    lazy = combine_da_to_df_track(
+        da.chunk({"time": 1}), daz.chunk({"time": 1}), df, method="idw", batch_size=100
+    )
+    idw = combine_da_to_df_track(da, daz, df, method="idw", batch_size=100)
+    np.testing.assert_allclose(lazy.o3_new.values, idw.o3_new.values)
+    assert np.isnan(idw.o3_new[0]) and not np.isnan(idw.o3_new[1:]).any()
+
+    with pytest.raises(ValueError, match="da must be named"):
+        combine_da_to_df_track(da.rename(None), daz, df)
+
+
+def test_combine_da_to_height_profile():
+    import pandas as pd
+
+    from monet.util.combinetool import combine_da_to_height_profile
+
+    lon, lat = np.linspace(-120, -70, 50), np.linspace(25, 50, 30)
+    times = pd.date_range("2020-07-01", periods=4, freq="h")
+    cell = np.arange(lat.size * lon.size, dtype=float).reshape(1, 1, lat.size, lon.size)
+    t = np.arange(4.0)[:, None, None, None]
+    height = np.arange(8)[None, :, None, None] * 500.0 + 0.01 * cell + 5 * t + 50
+    coords = {"time": times, "lat": lat, "lon": lon}
+    dims = ("time", "lev", "lat", "lon")
+    da = monet.dataset_to_monet(
+        xr.DataArray(2 * height + cell, dims=dims, coords=coords, name="ws")
+    )
+    daz = monet.dataset_to_monet(xr.DataArray(height, dims=dims, coords=coords))
+
+    iy, ix = np.array([3, 10, 20]), np.array([5, 25, 40])
+    z = np.array([20.0, 1000.0, 2000.0, 3000.0])
+    dset = xr.Dataset(
+        {"obs": (("time", "site", "z"), np.ones((3, 3, 4)))},
+        coords={
+            "time": times[1:],
+            "z": z,
+            "latitude": ("site", lat[iy]),
+            "longitude": ("site", lon[ix]),
+        },
+    )
+    out = combine_da_to_height_profile(da, dset, daz=daz)
+    assert out.ws.dims == ("time", "site", "z")
+    c = (iy * lon.size + ix).astype(float)
+    expected = np.broadcast_to(2 * z + c[:, None], (3, 3, 4)).copy()
+    # (below the lowest model level: value at that level)
+    expected[..., 0] = 2 * (50 + 0.01 * c + 5 * np.arange(1, 4)[:, None]) + c
+    np.testing.assert_allclose(out.ws.values, expected)
+
+    # Single site
+    one = dset.isel(site=1)
+    out = combine_da_to_height_profile(da, one, daz=daz)
+    assert out.ws.dims == ("time", "z")
+    np.testing.assert_allclose(out.ws.values, expected[:, 1])
+
+
+def test_iter_combine_da_to_swath(tmp_path):
+    import pandas as pd
+
+    from monet.util.combinetool import iter_combine_da_to_swath
+
+    lon, lat = np.linspace(-120, -70, 50), np.linspace(25, 50, 30)
+    times = pd.date_range("2020-07-01", periods=6, freq="h")
+    nz = 4
+    data = np.arange(6 * nz * lat.size * lon.size, dtype=float).reshape(6, nz, lat.size, lon.size)
+    da = monet.dataset_to_monet(
+        xr.DataArray(
+            data,
+            dims=("time", "z", "lat", "lon"),
+            coords={"time": times, "lat": lat, "lon": lon},
+            name="no2",
+        )
+    )
+
+    def granule(t0, iy, ix):
+        ak = np.ones(iy.shape + (nz,)) / nz
+        return xr.Dataset(
+            {
+                "no2": (("scanline", "pixel"), np.ones(iy.shape)),
+                "ak": (("scanline", "pixel", "layer"), ak),
+            },
+            coords={
+                "latitude": (("scanline", "pixel"), lat[iy]),
+                "longitude": (("scanline", "pixel"), lon[ix]),
+                "time": ("scanline", t0 + pd.to_timedelta(np.arange(iy.shape[0]) * 10, unit="min")),
+            },
+        )
+
+    iy, ix = np.meshgrid(np.arange(5, 11), np.arange(20, 24), indexing="ij")
+    granules = [
+        granule(times[1] + pd.Timedelta("5min"), iy, ix),
+        granule(times[4] + pd.Timedelta("20min"), iy + 10, ix),
+        granule(times[-1] + pd.Timedelta("2h"), iy, ix),  # no model data
+    ]
+    out = list(iter_combine_da_to_swath(da, granules, averaging_kernel="ak"))
+    assert len(out) == 3
+    assert out[0].no2_new.dims == ("scanline", "pixel")
+
+    # Nearest model time of each scanline: 10-min steps from t0
+    it = np.array([1, 1, 1, 2, 2, 2])
+    expected = data[it[:, None], :, iy, ix].mean(axis=-1)
+    np.testing.assert_allclose(out[0].no2_new.values, expected)
+    it = np.array([4, 4, 5, 5, 5, 5])
+    expected = data[it[:, None], :, iy + 10, ix].mean(axis=-1)
+    np.testing.assert_allclose(out[1].no2_new.values, expected)
+    assert out[2].no2_new.isnull().all()
+
+    profiles = next(iter_combine_da_to_swath(da, granules[0]))
+    assert profiles.no2_new.dims == ("scanline", "pixel", "z")
+
+    with pytest.raises(ValueError, match="da must be named"):
+        next(iter_combine_da_to_swath(da.rename(None), granules[0]))
+    members = xr.concat([da, da], dim="member")
+    with pytest.raises(ValueError, match=r"got extra dims \['member', 'z'\]"):
+        next(iter_combine_da_to_swath(members, granules[0], averaging_kernel="ak"))
+
+    # Granule files are loaded and closed
+    files = []
+    for i, g in enumerate(granules[:2]):
+        files.append(str(tmp_path / f"granule_{i}.nc"))
+        g.to_netcdf(files[-1])
+    closed = []
+
+    def open_func(fn):
+        ds = xr.open_dataset(fn)
+        close = ds._close
+        ds.set_close(lambda: (closed.append(fn), close()))
+        return ds
+
+    out_files = list(
+        iter_combine_da_to_swath(da, files, averaging_kernel="ak", open_func=open_func)
+    )
+    assert closed == files
+    np.testing.assert_allclose(out_files[1].no2_new.values, out[1].no2_new.values)
+
+
+def test_combine_models_to_df(monkeypatch):
+    import pandas as pd
+
+    import monet.util.resample
+    from monet.util.combinetool import combine_da_to_df, combine_models_to_df
+
+    times = pd.date_range("2020-07-01", periods=3, freq="h")
+    a = _make_grid(np.linspace(-120, -70, 50), np.linspace(25, 50, 30), nt=3)
+    a = a.assign_coords(time=times)
+    b = (a * 2).rename("data")
+    c = _make_grid(np.linspace(-115, -75, 40), np.linspace(28, 48, 20), nt=3)
+    c = c.assign_coords(time=times)
+    obs = pd.DataFrame(
+        {
+            "siteid": ["b", "a", "b", "c"],
+            "latitude": [40.0, 30.0, 40.0, 35.0],
+            "longitude": [-90.0, -100.0, -90.0, -95.0],
+            "time": times[[2, 0, 0, 1]],
+            "obs": 1.0,
+        }
+    )
+
+    calls = []
+    build_remapper = monet.util.resample.build_remapper
+
+    def counting_build_remapper(*args, **kwargs):
+        calls.append(1)
+        return build_remapper(*args, **kwargs)
+
+    monkeypatch.setattr(monet.util.resample, "build_remapper", counting_build_remapper)
+    out = combine_models_to_df({"a": a, "b": b, "c": c}, obs, radius_of_influence=1e5)
+    assert len(calls) == 2, "one neighbour search per distinct grid"
+
+    for name, model in [("a", a), ("b", b), ("c", c)]:
+        expected = combine_da_to_df(model, obs, radius_of_influence=1e5)
+        np.testing.assert_array_equal(out[f"data_{name}"], expected.data)
+    np.testing.assert_array_equal(out.data_b, 2 * out.data_a)
+
+    levels = xr.concat([a, a], dim="z").transpose("time", "z", ...)
+    with pytest.raises(ValueError, match="model 'levels' has extra dims"):
+        combine_models_to_df({"levels": levels}, obs, radius_of_influence=1e5)
+
+
+def test_paired_parquet(tmp_path):
+    import pandas as pd
+
+    from monet.util.combinetool import read_paired_parquet, write_paired_parquet
+
+    rs = np.random.default_rng(0)
+    times = pd.date_range("2020-07-01", periods=72, freq="h")
+    paired = pd.DataFrame({"time": times}).merge(
+        pd.DataFrame({"siteid": ["s0", "s1", "s2"], "latitude": [30.0, 35.0, 40.0]}),
+        how="cross",
+    )
+    paired = pd.concat([paired.assign(variable="OZONE"), paired.assign(variable="PM2.5")])
+    paired["obs"] = rs.random(len(paired))
+    paired["model"] = rs.random(len(paired))
+
+    path = tmp_path / "paired"
+    days = [g for _, g in paired.groupby(paired.time.dt.date)]
+    write_paired_parquet(days[:2], path)
+    write_paired_parquet(days[2], path)  # incremental append
+    assert sorted(p.name for p in path.iterdir()) == [
+        "date=2020-07-01",
+        "date=2020-07-02",
+        "date=2020-07-03",
+    ]
+    assert len(list(path.glob("date=2020-07-03/variable=OZONE/*.parquet"))) == 1
+
+    out = read_paired_parquet(path)
+    assert len(out) == len(paired)
+    assert out.obs.dtype == np.float32 and out.latitude.dtype == np.float64
+    assert isinstance(out.siteid.dtype, pd.CategoricalDtype)
+
+    out = read_paired_parquet(
+        path, sites=["s1"], start="2020-07-02 06:00", end="2020-07-03", variables=["OZONE"]
+    )
+    expected = paired[
+        (paired.siteid == "s1")
+        & (paired.time >= "2020-07-02 06:00")
+        & (paired.time <= "2020-07-03")
+        & (paired.variable == "OZONE")
+    ]
+    assert len(out) == len(expected) == 19
+    out = out.sort_values("time", ignore_index=True)
+    np.testing.assert_allclose(out.obs, expected.obs.astype(np.float32))
+
+    # re-running a day replaces its data
+    write_paired_parquet(days[2], path, mode="overwrite")
+    assert len(read_paired_parquet(path)) == len(paired)
@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+from monet.util import stats
+
+
+def _pairs(shape=(50, 40), seed=0, offset=0.0):
+    rs = np.random.default_rng(seed)
+    obs = rs.gamma(4, 10, size=shape) + offset
+    mod = obs * rs.normal(1.1, 0.3, size=shape) + rs.normal(0, 3, size=shape)
+    obs[rs.random(shape) < 0.1] = np.nan
+    mod[rs.random(shape) < 0.1] = np.nan
+    return stats.matchmasks(np.ma.masked_invalid(obs), np.ma.masked_invalid(mod))
+
+
+@pytest.mark.parametrize("offset", [0.0, -40.0, -200.0], ids=["positive", "mixed", "negative"])
+def test_compute_matches_metrics(offset):
+    obs, mod = _pairs(offset=offset)
+    out = stats.compute(obs, mod)
+    for name, value in out.items():
+        if name == "R":
+            expected = np.corrcoef(*stats.matchedcompressed(obs, mod))[0, 1]
+        else:
+            expected = getattr(stats, name)(obs, mod)
+        np.testing.assert_allclose(value, expected, rtol=1e-10, err_msg=name)
+
+
+def test_compute_wind_direction():
+    rs = np.random.default_rng(0)
+    obs = np.ma.masked_invalid(rs.uniform(0, 360, 1000))
+    mod = (obs + rs.normal(10, 40, 1000)) % 360
+    names = [name for name in stats._FUSED_METRICS if name.startswith("WD")]
+    assert not set(names) & set(stats.compute(obs, mod)), "not computed by default"
+    out = stats.compute(obs, mod, metrics=names)
+    for name in names:
+        np.testing.assert_allclose(out[name], getattr(stats, name)(obs, mod), rtol=1e-10)
+
+
+@pytest.mark.parametrize("axis", [0, 1])
+def test_compute_axis(axis):
+    obs, mod = _pairs()
+    names = ["MO", "MB", "NMB", "NME", "RMSE", "MNB", "FB", "FE", "IOA", "AC", "STDO"]
+    out = stats.compute(obs, mod, metrics=names, axis=axis)
+    for name in names:
+        expected = getattr(stats, name)(obs, mod, axis=axis)
+        assert out[name].shape == expected.shape
+        np.testing.assert_allclose(out[name], expected, rtol=1e-10, err_msg=name)
+
+
+def test_compute_nan_and_empty():
+    obs = np.array([1.0, 2.0, np.nan, 4.0])
+    mod = np.array([2.0, np.nan, 3.0, 5.0])
+    out = stats.compute(obs, mod, metrics=["NOP", "MB"])
+    assert out["NOP"] == 2 and out["MB"] == 1.0
+
+    out = stats.compute([np.nan], [1.0], metrics=["NOP", "RMSE"])
+    assert out["NOP"] == 0 and np.isnan(out["RMSE"])
+
+    with pytest.raises(ValueError, match="not available"):
+        stats.compute(obs, mod, metrics=["MdnB"])
+
+
+def test_compute_grouped():
+    import pandas as pd
+
+    obs, mod = _pairs()
+    groups = np.random.default_rng(1).integers(-1, 7, size=obs.shape)
+    groups[:, :3] = 7  # a group with all pairs masked
+    obs[:, :3] = np.ma.masked
+
+    names = ["NOP", "MO", "MB", "NMB", "NME", "RMSE", "MNB", "FE", "R2", "IOA", "d1", "USUTPB"]
+    out = stats.compute_grouped(obs, mod, groups, metrics=names, ngroups=8)
+    assert out["NOP"].dtype.kind == "i"
+    for g in range(8):
+        sel = groups == g
+        expected = stats.compute(obs[sel], mod[sel], metrics=names)
+        for name in names:
+            np.testing.assert_allclose(out[name][g], expected[name], rtol=1e-10, err_msg=name)
+    assert out["NOP"][7] == 0 and np.isnan(out["MB"][7])
+
+    df = pd.DataFrame({"obs": obs.filled(np.nan).ravel(), "mod": mod.filled(np.nan).ravel()})
+    df["g"] = groups.ravel()
+    df = df[(df.g >= 0) & (df.g < 7)]
+    expected = df.groupby("g").apply(lambda d: stats.NMB(d.obs, d["mod"]))
+    codes, uniques = pd.factorize(df.g, sort=True)
+    out = stats.compute_grouped(df.obs, df["mod"], codes, metrics=["NMB"])
+    np.testing.assert_allclose(out["NMB"], expected.values, rtol=1e-10)
+
+
+def test_stats_accumulator():
+    import pickle
+    from functools import reduce
+
+    obs, mod = _pairs(shape=(2000,))
+    names = ["NOP", "MB", "ME", "RMSE", "NMB", "NME", "R", "AC", "USUTPB", "WDMB", "WDRMSE"]
+    expected = stats.compute(obs, mod, metrics=names)
+
+    accs = [
+        stats.StatsAccumulator(names).update(o, m)
+        for o, m in zip(np.array_split(obs, 7), np.array_split(mod, 7))
+    ]
+    accs = [pickle.loads(pickle.dumps(acc)) for acc in accs]  # e.g. from a process pool
+    out = reduce(stats.StatsAccumulator.merge, accs).result()
+    for name in names:
+        np.testing.assert_allclose(out[name], expected[name], rtol=1e-10, err_msg=name)
+
+    # metrics about the obs mean, in a second pass
+    names = ["IOA", "d1", "E1", "WDIOA", "WDAC"]
+    with pytest.raises(ValueError, match="obs_mean is required"):
+        stats.StatsAccumulator(names)
+    acc = stats.StatsAccumulator(names, obs_mean=obs.mean())
+    for o, m in zip(np.array_split(obs, 3), np.array_split(mod, 3)):
+        acc.update(o, m)
+    expected = stats.compute(obs, mod, metrics=names)
+    for name in names:
+        np.testing.assert_allclose(acc.result()[name], expected[name], rtol=1e-10, err_msg=name)
+
+    assert np.isnan(stats.StatsAccumulator(["MB"]).result()["MB"])
+    with pytest.raises(ValueError, match="same metrics"):
+        stats.StatsAccumulator(["MB"]).merge(stats.StatsAccumulator(["ME"]))
+
+
+def test_stats_accumulator_median():
+    obs, mod = _pairs(shape=(5000,))
+    names = ["MdnO", "MdnP", "MdnB", "MdnE", "NMdnB", "NMdnE", "MdnNB", "MdnNE", "RMdn"]
+    names += ["WDMdnB", "WDMdnE", "MB"]
+    chunks = list(zip(np.array_split(obs, 10), np.array_split(mod, 10)))
+
+    exact = stats.StatsAccumulator(names)
+    sketch = stats.StatsAccumulator(names, median="sketch", k=100, seed=0)
+    for o, m in chunks[:5]:
+        exact.update(o, m)
+        sketch.update(o, m)
+    sketch2 = stats.StatsAccumulator(names, median="sketch", k=100, seed=1)
+    for o, m in chunks[5:]:
+        exact.update(o, m)
+        sketch2.update(o, m)
+    sketch.merge(sketch2)
+    assert all(q.size < 1000 for q in sketch.quantiles.values())
+
+    exact, sketch = exact.result(), sketch.result()
+    for name in names:
+        np.testing.assert_allclose(exact[name], getattr(stats, name)(obs, mod), err_msg=name)
+    # rank of the approximate medians
+    d = np.sort((mod - obs).compressed())
+    assert abs(np.searchsorted(d, sketch["MdnB"]) / d.size - 0.5) < 1.7 / 100
+    np.testing.assert_allclose(sketch["MdnO"], exact["MdnO"], rtol=0.05)
+    assert sketch["MB"] == exact["MB"]
+
+
+def test_quantile_sketch():
+    x = np.random.default_rng(0).normal(size=100_000)
+    sketch = stats.QuantileSketch(seed=0)
+    for chunk in np.array_split(x, 20):
+        sketch.update(chunk)
+    assert sketch.n == x.size and sketch.size < 3 * 200 + 50
+    q = np.array([0.01, 0.25, 0.5, 0.75, 0.99])
+    rank = np.searchsorted(np.sort(x), sketch.quantile(q)) / x.size
+    np.testing.assert_allclose(rank, q, atol=1.7 / 200)
+    assert np.isnan(stats.QuantileSketch().quantile(0.5))
+
+
+def test_compute_xarray():
+    import pandas as pd
+    import xarray as xr
+
+    obs, mod = _pairs(shape=(48, 6, 8))
+    coords = {
+        "time": pd.date_range("2020-07-01", periods=48, freq="h"),
+        "y": np.arange(6),
+        "x": np.arange(8) * 10.0,
+    }
+    dims = ["time", "y", "x"]
+    obs_da = xr.DataArray(obs.filled(np.nan), coords=coords, dims=dims).chunk({"y": 2})
+    mod_da = xr.DataArray(mod.filled(np.nan), coords=coords, dims=dims).chunk({"y": 2})
+
+    names = ["NOP", "MB", "RMSE", "NMB", "IOA", "R"]
+    out = stats.compute_xarray(obs_da, mod_da, metrics=names, dim="time")
+    assert out.MB.chunks is not None, "lazy"
+    assert out.MB.dims == ("y", "x") and (out.x == coords["x"]).all()
+    assert out.MB.attrs["long_name"] == "Mean Bias"
+
+    expected = stats.compute(obs, mod, metrics=names, axis=0)
+    out = out.compute()
+    for name in names:
+        np.testing.assert_allclose(out[name], expected[name], rtol=1e-10, err_msg=name)
+
+    out = stats.compute_xarray(obs_da, mod_da, metrics=["MB"], dim=["time", "x"])
+    np.testing.assert_allclose(out.MB, stats.compute(obs, mod, ["MB"], axis=(0, 2))["MB"])
+    out = stats.compute_xarray(obs_da.chunk({"y": -1}), mod_da.chunk({"y": -1}), ["NOP"])
+    assert out.NOP.dims == () and int(out.NOP) == obs.count()
+
+
+def test_compute_masked_int():
+    obs = np.ma.masked_array([1, 2, 3, 4], mask=[False, False, True, False])
+    mod = np.ma.masked_array([2, 2, 5, 7], mask=[False, False, True, False])
+    out = stats.compute(obs, mod, metrics=["NOP", "MB", "RMSE"])
+    assert out["NOP"] == 3
+    np.testing.assert_allclose(out["MB"], stats.MB(obs, mod))
+    np.testing.assert_allclose(out["RMSE"], stats.RMSE(obs, mod))
+    acc = stats.StatsAccumulator(["MB"]).update(obs, mod)
+    np.testing.assert_allclose(acc.result()["MB"], stats.MB(obs, mod))